@@ -0,0 +1 @@
+"""Benchmarks for the Remeha Home integration."""
@@ -0,0 +1,280 @@
+"""Microbenchmarks for the coordinator and entity hot paths.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.benchmark --appliances 4 --climate-zones 3 --output results.json
+
+Results are written as JSON, and can be compared against a previous run with
+`--compare previous.json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.remeha_home import binary_sensor, climate, sensor, switch
+from custom_components.remeha_home.api import fast_json_loads
+from custom_components.remeha_home.const import DOMAIN
+from custom_components.remeha_home.metrics import RequestMetrics
+from custom_components.remeha_home.tracing import Tracer
+from custom_components.remeha_home.coordinator import (
+    RemehaHomeConsumptionUpdateCoordinator,
+    RemehaHomeUpdateCoordinator,
+)
+from custom_components.remeha_home.models import parse_dashboard
+
+from .dashboard import (
+    generate_consumption_data,
+    generate_dashboard,
+    generate_technical_information,
+)
+
+
+class BenchmarkAPI:
+    """API returning synthetic data without any network requests."""
+
+    def __init__(self, dashboard: dict) -> None:
+        """Create an API returning the specified dashboard."""
+        self.dashboard_body = json.dumps(dashboard).encode()
+        self.metrics = RequestMetrics()
+        self.tracer = Tracer()
+
+    async def async_get_dashboard(self, only_if_changed: bool = False) -> dict:
+        """Return the dashboard."""
+        return fast_json_loads(self.dashboard_body)
+
+    def mark_dashboard_applied(self) -> None:
+        """Ignore the applied dashboard, as every dashboard is processed."""
+
+    async def async_get_appliance_technical_information(
+        self, appliance_id: str
+    ) -> dict:
+        """Return the technical information of an appliance."""
+        return generate_technical_information(appliance_id)
+
+    async def async_get_consumption_data_for_today(self, appliance_id: str) -> dict:
+        """Return the consumption data of an appliance."""
+        return generate_consumption_data()
+
+
+def measure(
+    function: Callable[[], object],
+    repeat: int,
+    number: int,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    """Measure the time per call of a function in microseconds.
+
+    The optional setup function is called before each batch and not measured.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        "min_us": min(timings),
+        "median_us": statistics.median(timings),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+async def async_run_benchmarks(args: argparse.Namespace) -> dict:
+    """Run all benchmarks and return the results."""
+    dashboard = generate_dashboard(
+        args.appliances, args.climate_zones, args.hot_water_zones
+    )
+    api = BenchmarkAPI(dashboard)
+    body = api.dashboard_body
+    raw = fast_json_loads(body)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = RemehaHomeUpdateCoordinator(hass, api)
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise RuntimeError("Initial refresh failed") from (
+                coordinator.last_exception
+            )
+
+        results["decode"] = measure(lambda: fast_json_loads(body), args.repeat, 10)
+        results["parse"] = measure(lambda: parse_dashboard(raw), args.repeat, 10)
+
+        def reset_index() -> None:
+            coordinator.items.clear()
+            coordinator.projections.clear()
+            coordinator.device_info.clear()
+            coordinator._device_info_inputs.clear()
+            coordinator._changed_keys = {}
+
+        # The parsed dashboards are prepared up front, so only the index build is measured
+        parsed = []
+
+        def prepare_parsed() -> None:
+            parsed.clear()
+            parsed.extend(parse_dashboard(raw) for _ in range(10))
+
+        def build_initial_index() -> None:
+            reset_index()
+            coordinator._build_index(parsed.pop())
+
+        results["index_build_initial"] = measure(
+            build_initial_index, args.repeat, 10, prepare_parsed
+        )
+        results["index_build_unchanged"] = measure(
+            lambda: coordinator._build_index(parsed.pop()),
+            args.repeat,
+            10,
+            prepare_parsed,
+        )
+
+        def build_device_info() -> None:
+            coordinator._device_info_inputs.clear()
+            for appliance in dashboard["appliances"]:
+                for climate_zone in appliance["climateZones"]:
+                    coordinator._update_device_info(
+                        climate_zone["climateZoneId"],
+                        name=climate_zone["name"],
+                        model="eTwist",
+                        hw_version="1.0",
+                        sw_version="2.0",
+                        via_device=(DOMAIN, appliance["applianceId"]),
+                    )
+
+        results["device_info"] = measure(build_device_info, args.repeat, 10)
+
+        consumption_coordinator = RemehaHomeConsumptionUpdateCoordinator(
+            hass, api, coordinator
+        )
+        await consumption_coordinator.async_refresh()
+        hass.data[DOMAIN] = {
+            "benchmark": {
+                "api": api,
+                "coordinator": coordinator,
+                "consumption_coordinator": consumption_coordinator,
+                # The energy analytics are computed from the recorder, once a day
+                "analytics_coordinator": None,
+            }
+        }
+        entry = SimpleNamespace(entry_id="benchmark", title="Benchmark")
+        entities = {}
+
+        async def setup_platforms() -> None:
+            for name, module in (
+                ("sensor", sensor),
+                ("binary_sensor", binary_sensor),
+                ("climate", climate),
+                ("switch", switch),
+            ):
+                entities[name] = []
+                await module.async_setup_entry(hass, entry, entities[name].extend)
+
+        def run_setup_platforms() -> None:
+            coroutine = setup_platforms()
+            try:
+                coroutine.send(None)
+            except StopIteration:
+                pass
+            else:
+                raise RuntimeError("Platform setup did not complete synchronously")
+
+        results["setup_entities"] = measure(run_setup_platforms, args.repeat, 10)
+
+        sensors = entities["sensor"]
+        climates = entities["climate"]
+
+        def read_sensors() -> None:
+            for entity in sensors:
+                entity.native_value  # noqa: B018
+
+        def read_climates() -> None:
+            for entity in climates:
+                entity.current_temperature  # noqa: B018
+                entity.target_temperature  # noqa: B018
+                entity.hvac_mode  # noqa: B018
+                entity.hvac_action  # noqa: B018
+                entity.preset_mode  # noqa: B018
+                entity.min_temp  # noqa: B018
+                entity.max_temp  # noqa: B018
+
+        results["sensor_native_value"] = measure(read_sensors, args.repeat, 100)
+        results["climate_properties"] = measure(read_climates, args.repeat, 100)
+
+        await hass.async_stop(force=True)
+
+    return {
+        "parameters": {
+            "appliances": args.appliances,
+            "climate_zones": args.climate_zones,
+            "hot_water_zones": args.hot_water_zones,
+            "dashboard_bytes": len(body),
+            "sensor_entities": len(sensors),
+            "climate_entities": len(climates),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def print_results(output: dict, previous: dict | None) -> None:
+    """Print the results as a table, including the change from a previous run."""
+    print(f"{'benchmark':<24} {'median (us)':>14} {'min (us)':>14} {'change':>8}")  # noqa: T201
+    for name, result in output["results"].items():
+        change = ""
+        if previous is not None and name in previous["results"]:
+            previous_median = previous["results"][name]["median_us"]
+            change = f"{result['median_us'] / previous_median:.2f}x"
+        print(  # noqa: T201
+            f"{name:<24} {result['median_us']:>14.1f} {result['min_us']:>14.1f} {change:>8}"
+        )
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appliances", type=int, default=1)
+    parser.add_argument("--climate-zones", type=int, default=1)
+    parser.add_argument("--hot-water-zones", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    output = asyncio.run(async_run_benchmarks(args))
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = json.load(file)
+
+    print_results(output, previous)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
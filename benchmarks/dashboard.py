@@ -0,0 +1,174 @@
+"""Synthetic Remeha Home API data for benchmarks and load tests."""
+
+from __future__ import annotations
+
+import random
+
+
+def generate_climate_zone(appliance_id: str, index: int, rng: random.Random) -> dict:
+    """Generate a climate zone as returned by the dashboard endpoint."""
+    zone_mode = rng.choice(["Scheduling", "TemporaryOverride", "Manual"])
+    return {
+        "climateZoneId": f"{appliance_id}-cz{index}",
+        "applianceId": appliance_id,
+        "name": f"Zone {index}",
+        "zoneIcon": 3,
+        "zoneType": "CH",
+        "activeComfortDemand": rng.choice(["Idle", "ProducingHeat", "RequestingHeat"]),
+        "zoneMode": zone_mode,
+        "controlStrategy": "Automatic",
+        "firePlaceModeActive": False,
+        "capabilityFirePlaceMode": True,
+        "roomTemperature": round(rng.uniform(15, 22), 1),
+        "setPoint": round(rng.uniform(15, 22) * 2) / 2,
+        "nextSetpoint": 19.0,
+        "nextSwitchTime": "2025-02-13T17:30:00Z",
+        "setPointMin": 5.0,
+        "setPointMax": 30.0,
+        "currentScheduleSetPoint": 16.0,
+        "activeHeatingClimateTimeProgramNumber": rng.randint(1, 3),
+        "capabilityCooling": False,
+        "capabilityTemporaryOverrideEndTime": True,
+        "preHeat": {"enabled": False, "active": False},
+        "temporaryOverride": {
+            "endTime": (
+                "2025-02-13T19:00:00Z"
+                if zone_mode == "TemporaryOverride"
+                else "0001-01-01T00:00:00Z"
+            )
+        },
+    }
+
+
+def generate_hot_water_zone(appliance_id: str, index: int, rng: random.Random) -> dict:
+    """Generate a hot water zone as returned by the dashboard endpoint."""
+    return {
+        "hotWaterZoneId": f"{appliance_id}-hw{index}",
+        "applianceId": appliance_id,
+        "name": f"DHW {index}",
+        "zoneType": "DHW",
+        "dhwZoneMode": "Scheduling",
+        "dhwStatus": rng.choice(["Idle", "ProducingHeat"]),
+        "dhwType": "Combi",
+        "nextSwitchActivity": "Reduced",
+        "capabilityBoostMode": True,
+        "dhwTemperature": round(rng.uniform(40, 60), 1),
+        "targetSetpoint": 60.0,
+        "reducedSetpoint": 15.0,
+        "comfortSetPoint": 60.0,
+        "setPointMin": 40.0,
+        "setPointMax": 65.0,
+        "setPointRanges": {
+            "comfortSetpointMin": 40.0,
+            "comfortSetpointMax": 65.0,
+            "reducedSetpointMin": 10.0,
+            "reducedSetpointMax": 60.0,
+        },
+        "boostDuration": None,
+        "boostModeEndTime": None,
+        "nextSwitchTime": "2025-02-13T22:00:00Z",
+        "activeDwhTimeProgramNumber": 1,
+    }
+
+
+def generate_appliance(
+    index: int, climate_zones: int, hot_water_zones: int, rng: random.Random
+) -> dict:
+    """Generate an appliance as returned by the dashboard endpoint."""
+    appliance_id = f"appliance{index}"
+    return {
+        "applianceId": appliance_id,
+        "applianceOnline": True,
+        "applianceConnectionStatus": "Connected",
+        "applianceType": "Boiler",
+        "pairingStatus": "Paired",
+        "houseName": f"Home {index}",
+        "errorStatus": "Running",
+        "activeThermalMode": "Idle",
+        "operatingMode": "AutomaticHeating",
+        "outdoorTemperatureInformation": {
+            "outdoorTemperatureSource": "None",
+            "internetOutdoorTemperature": None,
+            "applianceOutdoorTemperature": round(rng.uniform(-5, 15), 1),
+            "utilizeOutdoorTemperature": None,
+            "internetOutdoorTemperatureExpected": False,
+            "isDayTime": True,
+            "weatherCode": "light fog",
+            "cloudOutdoorTemperature": round(rng.uniform(-5, 15)),
+            "cloudOutdoorTemperatureStatus": "Ok",
+        },
+        "currentTimestamp": None,
+        "holidaySchedule": {
+            "startTime": "0001-01-01T00:00:00Z",
+            "endTime": "0001-01-01T00:00:00Z",
+            "active": False,
+        },
+        "autoFillingEnabled": False,
+        "waterPressure": round(rng.uniform(1.2, 2.0), 1),
+        "waterPressureOK": True,
+        "capabilityEnergyConsumption": True,
+        "capabilityCooling": False,
+        "capabilityPreHeat": True,
+        "capabilityMultiSchedule": True,
+        "isActive": True,
+        "hotWaterZones": [
+            generate_hot_water_zone(appliance_id, zone, rng)
+            for zone in range(hot_water_zones)
+        ],
+        "climateZones": [
+            generate_climate_zone(appliance_id, zone, rng)
+            for zone in range(climate_zones)
+        ],
+        "solarThermals": [],
+    }
+
+
+def generate_dashboard(
+    appliances: int = 1,
+    climate_zones: int = 1,
+    hot_water_zones: int = 1,
+    seed: int = 0,
+) -> dict:
+    """Generate a dashboard with the specified number of appliances and zones."""
+    rng = random.Random(seed)
+    return {
+        "appliances": [
+            generate_appliance(index, climate_zones, hot_water_zones, rng)
+            for index in range(appliances)
+        ]
+    }
+
+
+def generate_technical_information(appliance_id: str) -> dict:
+    """Generate the technical information of an appliance."""
+    return {
+        "applianceName": "Calenta Ace",
+        "internetConnectedGateways": [
+            {
+                "name": "eTwist",
+                "hardwareVersion": "1.0",
+                "softwareVersion": "2.0",
+            }
+        ],
+    }
+
+
+def generate_consumption_data(days: int = 1, seed: int = 0) -> dict:
+    """Generate daily consumption data for the specified number of days."""
+    rng = random.Random(seed)
+    return {
+        "startDateTimeUsed": "2023-01-03T00:00:00+00:00",
+        "endDateTimeUsed": "2023-01-03T00:00:00+00:00",
+        "data": [
+            {
+                "timeStamp": f"2023-01-{day % 28 + 1:02d}T00:00:00+00:00",
+                "heatingEnergyConsumed": round(rng.uniform(0, 30), 2),
+                "hotWaterEnergyConsumed": round(rng.uniform(0, 10), 2),
+                "coolingEnergyConsumed": 0,
+                "heatingEnergyDelivered": round(rng.uniform(0, 90), 2),
+                "hotWaterEnergyDelivered": round(rng.uniform(0, 25), 2),
+                "coolingEnergyDelivered": 0,
+            }
+            for day in range(days)
+        ],
+    }
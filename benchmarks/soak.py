@@ -0,0 +1,251 @@
+"""Soak test of the API client and coordinator against the stub cloud.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.soak --duration 3600 --appliances 4 --error-rate 0.01
+
+The real RemehaHomeAPI and coordinator run against a local stub of the cloud,
+while random commands are sent. Request counts, refresh latency percentiles,
+memory growth and event loop lag are reported as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.config_entry_oauth2_flow import OAuth2Session
+
+from custom_components.remeha_home.api import (
+    RemehaHomeAPI,
+    RemehaHomeOAuth2Implementation,
+    create_client_session,
+)
+from custom_components.remeha_home.const import DOMAIN
+from custom_components.remeha_home.coordinator import (
+    RemehaHomeConsumptionUpdateCoordinator,
+    RemehaHomeUpdateCoordinator,
+)
+
+from .stub_cloud import API_PREFIX, TOKEN_PATH, StubCloud, StubCloudConfig
+
+
+def percentiles(values: list[float]) -> dict:
+    """Return the latency percentiles of a list of durations in milliseconds."""
+    if len(values) < 2:
+        return {"count": len(values)}
+    quantiles = statistics.quantiles(values, n=100)
+    return {
+        "count": len(values),
+        "p50_ms": quantiles[49],
+        "p90_ms": quantiles[89],
+        "p99_ms": quantiles[98],
+        "max_ms": max(values),
+    }
+
+
+async def async_measure_loop_lag(lags: list[float], interval: float = 0.1) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def async_send_commands(
+    api: RemehaHomeAPI,
+    coordinator: RemehaHomeUpdateCoordinator,
+    interval: float,
+    rng: random.Random,
+    failures: list[str],
+) -> None:
+    """Send random climate zone commands."""
+    while True:
+        await asyncio.sleep(rng.expovariate(1 / interval))
+        climate_zone_ids = [
+            climate_zone.climate_zone_id
+            for appliance in coordinator.data["appliances"]
+            for climate_zone in appliance.climate_zones
+        ]
+        climate_zone_id = rng.choice(climate_zone_ids)
+        command = rng.choice(
+            [
+                lambda: api.async_set_manual(climate_zone_id, rng.randint(30, 44) / 2),
+                lambda: api.async_set_temporary_override(
+                    climate_zone_id, rng.randint(30, 44) / 2
+                ),
+                lambda: api.async_set_schedule(climate_zone_id, rng.randint(1, 3)),
+                lambda: api.async_set_off(climate_zone_id),
+                lambda: api.async_set_fireplace_mode(
+                    climate_zone_id, rng.random() < 0.5
+                ),
+            ]
+        )
+        try:
+            await command()
+        except Exception as err:
+            failures.append(type(err).__name__)
+
+
+async def async_run_soak(args: argparse.Namespace) -> dict:
+    """Run the soak test and return the results."""
+    stub = StubCloud(
+        StubCloudConfig(
+            appliances=args.appliances,
+            climate_zones=args.climate_zones,
+            hot_water_zones=args.hot_water_zones,
+            latency_median=args.latency,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            token_lifetime=args.token_lifetime,
+        )
+    )
+    base_url = await stub.async_start()
+    rng = random.Random(0)
+    tracemalloc.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+
+        token = stub.create_token()
+        token["expires_at"] = time.time() + token["expires_in"]
+        entry = ConfigEntry(
+            data={"auth_implementation": DOMAIN, "token": token},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source="user",
+            title="Soak test",
+            unique_id=None,
+            version=1,
+        )
+        # Register the entry directly, the integration itself is not set up
+        hass.config_entries._entries[entry.entry_id] = entry
+
+        implementation = RemehaHomeOAuth2Implementation(
+            async_get_clientsession(hass), token_url=base_url + TOKEN_PATH
+        )
+        session = create_client_session()
+        api = RemehaHomeAPI(
+            OAuth2Session(hass, entry, implementation),
+            base_url=base_url + API_PREFIX,
+            session=session,
+        )
+        api.async_schedule_token_refresh()
+        coordinator = RemehaHomeUpdateCoordinator(hass, api)
+        consumption_coordinator = RemehaHomeConsumptionUpdateCoordinator(
+            hass, api, coordinator
+        )
+
+        refresh_durations: list[float] = []
+        refresh_failures = 0
+        loop_lags: list[float] = []
+        command_failures: list[str] = []
+        memory_samples = []
+
+        # The coordinator has no listeners, so it is only refreshed by the soak loop
+        await coordinator.async_refresh()
+        await consumption_coordinator.async_refresh()
+        background_tasks = [
+            asyncio.create_task(async_measure_loop_lag(loop_lags)),
+            asyncio.create_task(
+                async_send_commands(
+                    api, coordinator, args.command_interval, rng, command_failures
+                )
+            ),
+        ]
+
+        start = time.monotonic()
+        while (elapsed := time.monotonic() - start) < args.duration:
+            refresh_start = time.perf_counter()
+            await coordinator.async_refresh()
+            refresh_durations.append((time.perf_counter() - refresh_start) * 1000)
+            if not coordinator.last_update_success:
+                refresh_failures += 1
+
+            current, _ = tracemalloc.get_traced_memory()
+            memory_samples.append((elapsed, current))
+            await asyncio.sleep(args.poll_interval)
+
+        for task in background_tasks:
+            task.cancel()
+        api.async_shutdown()
+        await session.close()
+        await hass.async_stop(force=True)
+
+    await stub.async_stop()
+    tracemalloc.stop()
+
+    return {
+        "parameters": vars(args),
+        "requests": dict(stub.request_counts),
+        "connections": len(stub.connections),
+        "responses": {
+            str(status): count for status, count in stub.status_counts.items()
+        },
+        "refresh": {
+            **percentiles(refresh_durations),
+            "failures": refresh_failures,
+            "update_interval_s": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+        },
+        "commands": {"failures": dict(Counter(command_failures))},
+        "memory": {
+            "start_bytes": memory_samples[0][1] if memory_samples else None,
+            "end_bytes": memory_samples[-1][1] if memory_samples else None,
+            "peak_bytes": max((sample[1] for sample in memory_samples), default=None),
+        },
+        "event_loop_lag": percentiles(loop_lags),
+        "api": {
+            "dashboard_unchanged_count": api.dashboard_unchanged_count,
+            "rate_limiter": api.rate_limiter_state,
+            "circuit_breaker": api.circuit_breaker_state,
+            "metrics": api.metrics.as_dict(),
+        },
+        "refresh_phases": coordinator.refresh_metrics.as_dict(),
+    }
+
+
+def main() -> None:
+    """Run the soak test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--poll-interval", type=float, default=1, help="seconds")
+    parser.add_argument("--command-interval", type=float, default=5, help="seconds")
+    parser.add_argument("--appliances", type=int, default=1)
+    parser.add_argument("--climate-zones", type=int, default=1)
+    parser.add_argument("--hot-water-zones", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--token-lifetime", type=int, default=3600, help="seconds")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run_soak(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Local stand-in for the Remeha Home cloud API for load and soak tests.
+
+The stub implements the dashboard, technical details, energy consumption and
+climate zone command endpoints of the API, and the token endpoint of the login
+service. Commands change the state that is returned by the dashboard. Latency,
+server errors, throttling and token lifetime can be configured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import secrets
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from aiohttp import web
+
+from .dashboard import (
+    generate_consumption_data,
+    generate_dashboard,
+    generate_technical_information,
+)
+
+API_PREFIX = "/Mobile/api"
+TOKEN_PATH = "/oauth2/v2.0/token"
+
+
+@dataclass
+class StubCloudConfig:
+    """Behaviour of the stub cloud."""
+
+    appliances: int = 1
+    climate_zones: int = 1
+    hot_water_zones: int = 1
+    # Response latency follows a log-normal distribution with this median in seconds
+    latency_median: float = 0.05
+    latency_sigma: float = 0.5
+    # Probability of a request failing with a 503 response
+    error_rate: float = 0.0
+    # Probability of a request starting a burst of 429 responses
+    throttle_rate: float = 0.0
+    throttle_burst: int = 5
+    retry_after: int = 2
+    # Lifetime of the access tokens in seconds
+    token_lifetime: int = 3600
+    # Probability of a dashboard request observing a changed room temperature
+    change_rate: float = 0.2
+    seed: int = 0
+
+
+class StubCloud:
+    """Stub of the Remeha Home cloud with a server-side state machine."""
+
+    def __init__(self, config: StubCloudConfig) -> None:
+        """Create the stub cloud with a generated dashboard."""
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self.dashboard = generate_dashboard(
+            config.appliances, config.climate_zones, config.hot_water_zones, config.seed
+        )
+        self.climate_zones = {
+            climate_zone["climateZoneId"]: climate_zone
+            for appliance in self.dashboard["appliances"]
+            for climate_zone in appliance["climateZones"]
+        }
+        self.tokens: dict[str, float] = {}
+        self.request_counts: Counter[str] = Counter()
+        self.status_counts: Counter[int] = Counter()
+        # Client addresses of the connections, to check the reuse of connections
+        self.connections: set[tuple] = set()
+        self._throttle_remaining = 0
+        self._runner: web.AppRunner | None = None
+
+    def create_token(self) -> dict:
+        """Create a new token response."""
+        access_token = secrets.token_urlsafe()
+        self.tokens[access_token] = time.time() + self.config.token_lifetime
+        return {
+            "access_token": access_token,
+            "refresh_token": secrets.token_urlsafe(),
+            "token_type": "Bearer",
+            "expires_in": self.config.token_lifetime,
+        }
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application serving the stub."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post(TOKEN_PATH, self._handle_token, name="token")
+        app.router.add_get(
+            API_PREFIX + "/homes/dashboard", self._handle_dashboard, name="dashboard"
+        )
+        app.router.add_get(
+            API_PREFIX + "/appliances/{appliance_id}/technicaldetails",
+            self._handle_technical_details,
+            name="technicaldetails",
+        )
+        app.router.add_get(
+            API_PREFIX + "/appliances/{appliance_id}/energyconsumption/{period}",
+            self._handle_energy_consumption,
+            name="energyconsumption",
+        )
+        app.router.add_post(
+            API_PREFIX + "/climate-zones/{climate_zone_id}/modes/{mode}",
+            self._handle_mode,
+            name="mode",
+        )
+        app.router.add_post(
+            API_PREFIX
+            + "/climate-zones/{climate_zone_id}/time-programs/heating/{program}/activate",
+            self._handle_activate_program,
+            name="activate",
+        )
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving the stub and return its base url."""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def async_stop(self) -> None:
+        """Stop serving the stub."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Apply latency, throttling, errors and authentication to requests."""
+        route = request.match_info.route.name or "unknown"
+        self.request_counts[route] += 1
+        if request.transport is not None:
+            self.connections.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(
+            self._rng.lognormvariate(0, self.config.latency_sigma)
+            * self.config.latency_median
+        )
+
+        response = self._fault_response(request)
+        if response is None:
+            response = await handler(request)
+        self.status_counts[response.status] += 1
+        return response
+
+    def _fault_response(self, request: web.Request) -> web.Response | None:
+        """Return an injected error response, or None to handle the request."""
+        if request.path == TOKEN_PATH:
+            return None
+
+        if self._throttle_remaining == 0 and (
+            self._rng.random() < self.config.throttle_rate
+        ):
+            self._throttle_remaining = self.config.throttle_burst
+        if self._throttle_remaining > 0:
+            self._throttle_remaining -= 1
+            return web.Response(
+                status=429, headers={"Retry-After": str(self.config.retry_after)}
+            )
+
+        if self._rng.random() < self.config.error_rate:
+            return web.Response(status=503)
+
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if self.tokens.get(token, 0) < time.time():
+            return web.Response(status=401)
+        return None
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Handle a token request."""
+        data = await request.post()
+        if data.get("grant_type") != "refresh_token" or not data.get("refresh_token"):
+            return web.json_response(
+                {"error_description": "Unsupported grant"}, status=400
+            )
+        return web.json_response(self.create_token())
+
+    async def _handle_dashboard(self, request: web.Request) -> web.Response:
+        """Handle a dashboard request, randomly changing room temperatures."""
+        if self.climate_zones and self._rng.random() < self.config.change_rate:
+            climate_zone = self._rng.choice(list(self.climate_zones.values()))
+            climate_zone["roomTemperature"] = round(
+                climate_zone["roomTemperature"] + self._rng.choice([-0.1, 0.1]), 1
+            )
+        return web.json_response(self.dashboard)
+
+    async def _handle_technical_details(self, request: web.Request) -> web.Response:
+        """Handle a technical details request."""
+        return web.json_response(
+            generate_technical_information(request.match_info["appliance_id"])
+        )
+
+    async def _handle_energy_consumption(self, request: web.Request) -> web.Response:
+        """Handle an energy consumption request for the requested number of days."""
+        days = 1
+        try:
+            start = datetime.fromisoformat(request.query["startDate"].rstrip("Z"))
+            end = datetime.fromisoformat(request.query["endDate"].rstrip("Z"))
+            days = max(1, (end - start).days + 1)
+        except (KeyError, ValueError):
+            pass
+        return web.json_response(generate_consumption_data(days, self._rng.random()))
+
+    async def _handle_mode(self, request: web.Request) -> web.Response:
+        """Handle a climate zone mode command."""
+        climate_zone = self.climate_zones.get(request.match_info["climate_zone_id"])
+        if climate_zone is None:
+            return web.Response(status=404)
+
+        mode = request.match_info["mode"]
+        data = await request.json() if request.can_read_body else {}
+        if mode == "manual":
+            climate_zone["zoneMode"] = "Manual"
+            climate_zone["setPoint"] = data["roomTemperatureSetPoint"]
+        elif mode == "temporary-override":
+            climate_zone["zoneMode"] = "TemporaryOverride"
+            climate_zone["setPoint"] = data["roomTemperatureSetPoint"]
+        elif mode == "schedule":
+            climate_zone["zoneMode"] = "Scheduling"
+            climate_zone["activeHeatingClimateTimeProgramNumber"] = data[
+                "heatingProgramId"
+            ]
+            climate_zone["setPoint"] = climate_zone["currentScheduleSetPoint"]
+        elif mode == "anti-frost":
+            climate_zone["zoneMode"] = "FrostProtection"
+        elif mode == "fireplacemode":
+            climate_zone["firePlaceModeActive"] = data["fireplaceModeActive"]
+        else:
+            return web.Response(status=404)
+        return web.Response()
+
+    async def _handle_activate_program(self, request: web.Request) -> web.Response:
+        """Handle the activation of a heating time program."""
+        climate_zone = self.climate_zones.get(request.match_info["climate_zone_id"])
+        if climate_zone is None:
+            return web.Response(status=404)
+        climate_zone["activeHeatingClimateTimeProgramNumber"] = int(
+            request.match_info["program"]
+        )
+        return web.Response()
@@ -2,16 +2,47 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+import logging
+import random
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_EMAIL, EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import RemehaHomeOAuth2Implementation, RemehaHomeAPI
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+
+from .api import (
+    RemehaHomeOAuth2Implementation,
+    RemehaHomeAPI,
+    create_client_session,
+    create_rate_budget,
+)
 from .config_flow import RemehaHomeLoginFlowHandler
-from .const import DOMAIN
-from .coordinator import RemehaHomeUpdateCoordinator
+from .const import (
+    DATA_CLIENT_SESSION,
+    DATA_RATE_BUDGET,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+    ENERGY_BACKFILL_STORAGE_KEY,
+    ENERGY_BACKFILL_STORAGE_VERSION,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    TECHNICAL_INFO_STORAGE_KEY,
+    TECHNICAL_INFO_STORAGE_VERSION,
+)
+from .coordinator import (
+    RemehaHomeConsumptionUpdateCoordinator,
+    RemehaHomeEnergyAnalyticsUpdateCoordinator,
+    RemehaHomeUpdateCoordinator,
+)
+from .energy_analytics import HAS_NUMPY
+from .energy_backfill import RemehaHomeEnergyBackfill
+from .services import async_setup_services
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -24,12 +55,28 @@ PLATFORMS: list[Platform] = [
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up Remeha Home."""
     hass.data.setdefault(DOMAIN, {})
+    # All accounts share a single request budget for the Remeha Home cloud
+    hass.data[DATA_RATE_BUDGET] = create_rate_budget()
+
+    if not HAS_NUMPY:
+        _LOGGER.warning(
+            "NumPy is not installed, the Remeha Home energy analytics sensors "
+            "are disabled"
+        )
 
     RemehaHomeLoginFlowHandler.async_register_implementation(
         hass,
         RemehaHomeOAuth2Implementation(async_get_clientsession(hass)),
     )
 
+    async_setup_services(hass)
+
+    async def async_close_client_session(_event: Event) -> None:
+        """Close the HTTP session for the API host when Home Assistant stops."""
+        await _async_close_client_session(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_close_client_session)
+
     return True
 
 
@@ -41,19 +88,110 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         )
     )
 
+    # All accounts share the HTTP session for the API host and its connection pool
+    if DATA_CLIENT_SESSION not in hass.data:
+        hass.data[DATA_CLIENT_SESSION] = create_client_session()
+
     oauth_session = config_entry_oauth2_flow.OAuth2Session(hass, entry, implementation)
-    api = RemehaHomeAPI(oauth_session)
-    coordinator = RemehaHomeUpdateCoordinator(hass, api)
+    api = RemehaHomeAPI(
+        oauth_session,
+        rate_budget=hass.data[DATA_RATE_BUDGET],
+        session=hass.data[DATA_CLIENT_SESSION],
+    )
+    api.async_schedule_token_refresh()
+    entry.async_on_unload(api.async_shutdown)
+    coordinator = RemehaHomeUpdateCoordinator(
+        hass, api, config_entry=entry, poll_offset=_poll_offset(hass, entry)
+    )
+    await coordinator.async_load_technical_info()
+
+    if await coordinator.async_load_snapshot():
+        # Create the entities from the restored snapshot and update them in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
-    await coordinator.async_config_entry_first_refresh()
+    # The consumption is polled on its own schedule, without delaying the setup
+    consumption_coordinator = RemehaHomeConsumptionUpdateCoordinator(
+        hass, api, coordinator, config_entry=entry
+    )
+    entry.async_create_background_task(
+        hass, consumption_coordinator.async_refresh(), f"{DOMAIN} consumption refresh"
+    )
+
+    # The energy analytics are computed with NumPy, when it is installed
+    analytics_coordinator = (
+        RemehaHomeEnergyAnalyticsUpdateCoordinator(
+            hass, coordinator, config_entry=entry
+        )
+        if HAS_NUMPY
+        else None
+    )
 
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "consumption_coordinator": consumption_coordinator,
+        "analytics_coordinator": analytics_coordinator,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Import the consumption history now and once a day, at a random minute so
+    # not all installations request it at the same time. The energy analytics
+    # are computed after each import, from the history up to yesterday.
+    energy_backfill = RemehaHomeEnergyBackfill(hass, api, entry.entry_id)
+
+    async def async_run_energy_backfill() -> None:
+        """Import the consumption history and update the energy analytics."""
+        await energy_backfill.async_run(coordinator.data["appliances"])
+        if analytics_coordinator is not None:
+            await analytics_coordinator.async_refresh()
+
+    @callback
+    def async_start_energy_backfill(_now: datetime | None = None) -> None:
+        """Start importing the consumption history in the background."""
+        if coordinator.data is not None:
+            entry.async_create_background_task(
+                hass, async_run_energy_backfill(), f"{DOMAIN} energy backfill"
+            )
+
+    async_start_energy_backfill()
+    entry.async_on_unload(
+        async_track_time_change(
+            hass,
+            async_start_energy_backfill,
+            hour=1,
+            minute=random.randrange(60),
+            second=0,
+        )
+    )
+
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > 1:
+        # Downgraded from a future version
+        return False
+
+    if entry.minor_version < 2:
+        # Store the account email and use it as the unique ID. Entries created
+        # before multiple accounts were supported use the domain as unique ID
+        # and have the email as their original title.
+        email = entry.data.get(CONF_EMAIL)
+        if email is None:
+            email = entry.unique_id if entry.unique_id != DOMAIN else entry.title
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_EMAIL: email},
+            unique_id=email.lower(),
+            minor_version=2,
+        )
+
     return True
 
 
@@ -61,5 +199,45 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            await _async_close_client_session(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a config entry."""
+    await Store(
+        hass,
+        TECHNICAL_INFO_STORAGE_VERSION,
+        f"{TECHNICAL_INFO_STORAGE_KEY}.{entry.entry_id}",
+    ).async_remove()
+    await Store(
+        hass, SNAPSHOT_STORAGE_VERSION, f"{SNAPSHOT_STORAGE_KEY}.{entry.entry_id}"
+    ).async_remove()
+    await Store(
+        hass,
+        ENERGY_BACKFILL_STORAGE_VERSION,
+        f"{ENERGY_BACKFILL_STORAGE_KEY}.{entry.entry_id}",
+    ).async_remove()
+
+
+async def _async_close_client_session(hass: HomeAssistant) -> None:
+    """Close the HTTP session for the API host, if it is open."""
+    if (session := hass.data.pop(DATA_CLIENT_SESSION, None)) is not None:
+        await session.close()
+
+
+def _poll_offset(hass: HomeAssistant, entry: ConfigEntry) -> timedelta:
+    """Return the offset of the polls of an entry within the minimum interval.
+
+    The entries are spread evenly, so multiple accounts do not poll the cloud at
+    the same time.
+    """
+    entry_ids = [
+        config_entry.entry_id
+        for config_entry in hass.config_entries.async_entries(DOMAIN)
+    ]
+    return (
+        DEFAULT_MIN_UPDATE_INTERVAL * entry_ids.index(entry.entry_id) / len(entry_ids)
+    )
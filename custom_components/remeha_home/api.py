@@ -1,23 +1,71 @@
 """API for Remeha Home bound to Home Assistant OAuth."""
 
+from __future__ import annotations
+
 import base64
 import datetime
+import email.utils
 import hashlib
 import json
 import logging
+import random
 import secrets
+import time
 import urllib
 
+from collections.abc import Callable
+from typing import Any
+
 import asyncio
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientRequest, ClientSession, TCPConnector
+from aiohttp.hdrs import ACCEPT_ENCODING, USER_AGENT
+from yarl import URL
+
+try:
+    from orjson import loads as fast_json_loads
+except ImportError:
+    from json import loads as fast_json_loads
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, callback
+from homeassistant.helpers.aiohttp_client import (
+    SERVER_SOFTWARE,
+    async_get_clientsession,
+)
+from homeassistant.helpers.event import async_call_later
 
 from homeassistant.helpers.config_entry_oauth2_flow import (
     AbstractOAuth2Implementation,
     OAuth2Session,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
-
-from .const import DOMAIN
+import homeassistant.util.ssl as ssl_util
+
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API_BASE_URL,
+    API_DNS_CACHE_TTL,
+    API_KEEPALIVE_TIMEOUT,
+    API_MAX_CONNECTIONS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    DOMAIN,
+    JSON_EXECUTOR_THRESHOLD,
+    MAX_REQUEST_RETRIES,
+    MAX_RETRY_DELAY,
+    READ_RATE_LIMIT,
+    READ_RATE_LIMIT_BURST,
+    REQUEST_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_STATUS_CODES,
+    TOKEN_REFRESH_JITTER,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_URL,
+    WRITE_RATE_LIMIT,
+    WRITE_RATE_LIMIT_BURST,
+)
+from .metrics import RequestMetrics
+from .rate_limit import RateBudget
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,44 +76,332 @@ class RemehaHomeAPI:
     def __init__(
         self,
         oauth_session: OAuth2Session = None,
+        base_url: str = API_BASE_URL,
+        json_loads: Callable[[bytes], Any] = fast_json_loads,
+        json_executor_threshold: int = JSON_EXECUTOR_THRESHOLD,
+        rate_budget: RateBudget | None = None,
+        session: ClientSession | None = None,
     ) -> None:
-        """Initialize Remeha Home auth."""
+        """Initialize Remeha Home auth.
+
+        Requests are sent through the session, or through the shared session of
+        Home Assistant when no session is specified.
+        """
         self._oauth_session = oauth_session
+        self._session = session or async_get_clientsession(oauth_session.hass)
+        self._base_url = base_url
+        self._json_loads = json_loads
+        self._json_executor_threshold = json_executor_threshold
+        self.json_decode_stats: dict[str, dict] = {}
+        self.metrics = RequestMetrics()
+        self.tracer = Tracer()
+        # Fingerprints of the last applied and the last received dashboard
+        self._dashboard_fingerprint: bytes | None = None
+        self._received_dashboard_fingerprint: bytes | None = None
+        self.dashboard_unchanged_count = 0
+        self._token_refresh_task: asyncio.Task | None = None
+        # The rate budget can be shared with the API clients of other accounts
+        self._rate_budget = rate_budget or create_rate_budget()
+        self._circuit_breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            CIRCUIT_BREAKER_RESET_TIMEOUT.total_seconds(),
+        )
+        self.throttled_count = 0
+        self.retry_count = 0
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
 
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
         if not self._oauth_session.valid_token:
-            await self._oauth_session.async_ensure_token_valid()
+            await self._async_refresh_token()
 
         return self._oauth_session.token["access_token"]
 
-    async def _async_api_request(self, method: str, path: str, **kwargs):
+    async def _async_refresh_token(self) -> None:
+        """Refresh the access token.
+
+        Concurrent callers share a single refresh request. The refresh is shielded
+        from cancellation, so a cancelled caller does not abort it for the others.
+        """
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = self._oauth_session.hass.async_create_task(
+                self._async_request_new_token(), f"{DOMAIN} token refresh"
+            )
+        await asyncio.shield(self._token_refresh_task)
+
+    async def _async_request_new_token(self) -> None:
+        """Request a new token and store it in the config entry."""
+        session = self._oauth_session
+        new_token = await session.implementation.async_refresh_token(session.token)
+        session.hass.config_entries.async_update_entry(
+            session.config_entry, data={**session.config_entry.data, "token": new_token}
+        )
+        self.async_schedule_token_refresh()
+
+    @callback
+    def async_schedule_token_refresh(self) -> None:
+        """Schedule a refresh of the access token ahead of its expiry.
+
+        A random jitter is subtracted from the refresh time, so multiple instances
+        do not refresh their tokens at the same time.
+        """
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+
+        delay = (
+            self._oauth_session.token["expires_at"]
+            - time.time()
+            - TOKEN_REFRESH_MARGIN.total_seconds()
+            - random.uniform(0, TOKEN_REFRESH_JITTER.total_seconds())
+        )
+        self._unsub_token_refresh = async_call_later(
+            self._oauth_session.hass,
+            max(delay, 0),
+            HassJob(self._async_proactive_token_refresh, cancel_on_shutdown=True),
+        )
+
+    async def _async_proactive_token_refresh(self, _now: datetime.datetime) -> None:
+        """Refresh the access token before it expires."""
+        self._unsub_token_refresh = None
+        try:
+            await self._async_refresh_token()
+        except (ClientError, asyncio.TimeoutError, ConfigEntryAuthFailed) as err:
+            # The token is refreshed on demand when the next request is made
+            _LOGGER.warning("Failed to refresh the access token in advance: %s", err)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the scheduled refresh of the access token."""
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+
+    async def async_prewarm_connection(self) -> None:
+        """Open a connection to the API host, so the next request can reuse it.
+
+        The connection is returned to the pool of the session without sending a
+        request, so it does not count towards the request budget.
+        """
+        request = ClientRequest(
+            "GET", URL(self._base_url), loop=asyncio.get_running_loop()
+        )
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT.total_seconds()):
+                connection = await self._session.connector.connect(
+                    request, [], self._session.timeout
+                )
+        except (ClientError, OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Failed to open a connection to the API: %s", err)
+            return
+        connection.release()
+
+    async def _async_api_request(self, method: str, path: str, endpoint: str, **kwargs):
+        """Perform a rate limited request to the Remeha Home API.
+
+        The endpoint names the request in the metrics.
+
+        Requests that are throttled or fail with a transient server error are
+        retried with an exponential backoff, honoring the Retry-After header.
+        """
+        # Make sure the token is valid, so concurrent requests share a single refresh
+        with self.tracer.span("token"):
+            await self.async_get_access_token()
+
         headers = kwargs.pop("headers", {})
-        return await self._oauth_session.async_request(
-            method,
-            "https://api.bdrthermea.net/Mobile/api" + path,
-            **kwargs,
-            headers={
-                **headers,
-                "Ocp-Apim-Subscription-Key": "df605c5470d846fc91e848b1cc653ddf",
-            },
+        bucket = (
+            self._rate_budget.read_bucket
+            if method == "GET"
+            else self._rate_budget.write_bucket
+        )
+
+        for attempt in range(MAX_REQUEST_RETRIES + 1):
+            with self.tracer.span("rate_limit", attempt=attempt):
+                await self._async_wait_for_retry_after()
+                await bucket.async_acquire()
+
+            response = await self._async_send_request(
+                method,
+                self._base_url + path,
+                endpoint,
+                **kwargs,
+                headers={
+                    **headers,
+                    "Ocp-Apim-Subscription-Key": "df605c5470d846fc91e848b1cc653ddf",
+                },
+            )
+            if (
+                response.status not in RETRY_STATUS_CODES
+                or attempt == MAX_REQUEST_RETRIES
+            ):
+                return response
+
+            # Use exponential backoff with full jitter unless the server specified a delay
+            delay = _parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = random.uniform(0, RETRY_BACKOFF_BASE * 2**attempt)
+            if response.status == 429:
+                self.throttled_count += 1
+                self._rate_budget.retry_after = max(
+                    self._rate_budget.retry_after, time.monotonic() + delay
+                )
+
+            _LOGGER.debug(
+                "Request %s %s returned status %d, retrying in %.1f seconds",
+                method,
+                path,
+                response.status,
+                delay,
+            )
+            response.release()
+            self.retry_count += 1
+            await self._async_wait_for_retry_after(delay)
+
+    async def _async_send_request(self, method: str, url: str, endpoint: str, **kwargs):
+        """Send a request through the circuit breaker.
+
+        Timeouts, connection errors and server errors count as failures. While the
+        circuit is open, requests fail immediately except for sparse probes.
+        """
+        if not self._circuit_breaker.allow_request():
+            raise RemehaHomeCircuitOpen
+
+        headers = kwargs.pop("headers", {})
+        access_token = self._oauth_session.token["access_token"]
+        start = time.perf_counter()
+        with self.tracer.span("request", endpoint=endpoint) as span:
+            try:
+                async with asyncio.timeout(REQUEST_TIMEOUT.total_seconds()):
+                    response = await self._session.request(
+                        method,
+                        url,
+                        **kwargs,
+                        headers={**headers, "Authorization": f"Bearer {access_token}"},
+                    )
+            except (ClientError, asyncio.TimeoutError) as err:
+                self.metrics.record_request(
+                    endpoint, time.perf_counter() - start, error=type(err).__name__
+                )
+                self._circuit_breaker.record_failure()
+                raise
+            if span is not None:
+                span.attributes["status"] = response.status
+
+        self.metrics.record_request(
+            endpoint, time.perf_counter() - start, status=response.status
+        )
+
+        if response.status >= 500:
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
+        return response
+
+    @property
+    def circuit_breaker_state(self) -> dict:
+        """Return the state of the circuit breaker."""
+        return {
+            "state": self._circuit_breaker.state,
+            "consecutive_failures": self._circuit_breaker.consecutive_failures,
+            "open_count": self._circuit_breaker.open_count,
+        }
+
+    async def _async_wait_for_retry_after(self, delay: float = 0) -> None:
+        """Wait until requests are allowed again after being throttled."""
+        delay = max(delay, self._rate_budget.retry_after - time.monotonic())
+        if delay <= 0:
+            return
+        if delay > MAX_RETRY_DELAY:
+            raise RemehaHomeRateLimited(delay)
+        await asyncio.sleep(delay)
+
+    @property
+    def rate_limiter_state(self) -> dict:
+        """Return the state of the rate limiter."""
+        return {
+            "read_tokens": self._rate_budget.read_bucket.tokens,
+            "write_tokens": self._rate_budget.write_bucket.tokens,
+            "retry_after": max(0, self._rate_budget.retry_after - time.monotonic()),
+            "throttled_count": self.throttled_count,
+            "retry_count": self.retry_count,
+        }
+
+    async def _async_read_body(self, endpoint: str, response) -> bytes:
+        """Read a response body, recording its size in the metrics."""
+        with self.tracer.span("read", endpoint=endpoint) as span:
+            body = await response.read()
+            if span is not None:
+                span.attributes["bytes"] = len(body)
+        self.metrics.record_bytes(endpoint, len(body))
+        return body
+
+    async def _async_decode_json(self, endpoint: str, body: bytes):
+        """Decode a JSON response body.
+
+        Bodies larger than the executor threshold are decoded in the executor, so
+        they do not block the event loop.
+        """
+        start = time.perf_counter()
+        with self.tracer.span("decode", endpoint=endpoint, bytes=len(body)):
+            if len(body) > self._json_executor_threshold:
+                data = await self._oauth_session.hass.async_add_executor_job(
+                    self._json_loads, body
+                )
+            else:
+                data = self._json_loads(body)
+        duration = time.perf_counter() - start
+
+        stats = self.json_decode_stats.setdefault(
+            endpoint, {"count": 0, "bytes": 0, "max_bytes": 0, "seconds": 0.0}
+        )
+        stats["count"] += 1
+        stats["bytes"] += len(body)
+        stats["max_bytes"] = max(stats["max_bytes"], len(body))
+        stats["seconds"] += duration
+        _LOGGER.debug(
+            "Decoded %d bytes of %s data in %.2f ms",
+            len(body),
+            endpoint,
+            duration * 1000,
         )
+        return data
+
+    async def async_get_dashboard(self, only_if_changed: bool = False) -> dict | None:
+        """Return the Remeha Home dashboard JSON.
 
-    async def async_get_dashboard(self) -> dict:
-        """Return the Remeha Home dashboard JSON."""
+        When only_if_changed is set and the response is identical to the last
+        dashboard applied with mark_dashboard_applied, None is returned without
+        decoding the response.
+        """
         # Add a timestamp to the request to prevent caching
         timestamp = int(datetime.datetime.now().timestamp())
         response = await self._async_api_request(
-            "GET", f"/homes/dashboard?t={timestamp}"
+            "GET", f"/homes/dashboard?t={timestamp}", "dashboard"
         )
         response.raise_for_status()
-        return await response.json()
+        body = await self._async_read_body("dashboard", response)
+
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        if only_if_changed and fingerprint == self._dashboard_fingerprint:
+            self.dashboard_unchanged_count += 1
+            return None
+
+        self._received_dashboard_fingerprint = fingerprint
+        return await self._async_decode_json("dashboard", body)
+
+    def mark_dashboard_applied(self) -> None:
+        """Mark the last received dashboard as successfully applied.
+
+        Only identical responses to an applied dashboard are skipped, so a
+        dashboard that failed to be parsed or applied is processed again.
+        """
+        self._dashboard_fingerprint = self._received_dashboard_fingerprint
 
     async def async_set_manual(self, climate_zone_id: str, setpoint: float):
         """Set a climate zone to manual mode with a specific temperature setpoint."""
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/modes/manual",
+            "set_manual",
             json={
                 "roomTemperatureSetPoint": setpoint,
             },
@@ -80,6 +416,7 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/modes/schedule",
+            "set_schedule",
             json={
                 "heatingProgramId": heating_program_id,
             },
@@ -91,6 +428,7 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/modes/temporary-override",
+            "set_temporary_override",
             json={
                 "roomTemperatureSetPoint": setpoint,
             },
@@ -102,6 +440,7 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/modes/anti-frost",
+            "set_off",
         )
         response.raise_for_status()
 
@@ -112,6 +451,7 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/time-programs/heating/{time_program_id}/activate",
+            "activate_heating_time_program",
         )
         response.raise_for_status()
 
@@ -120,6 +460,7 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "POST",
             f"/climate-zones/{climate_zone_id}/modes/fireplacemode",
+            "set_fireplace_mode",
             json={"fireplaceModeActive": enabled},
         )
         response.raise_for_status()
@@ -131,38 +472,118 @@ class RemehaHomeAPI:
         response = await self._async_api_request(
             "GET",
             f"/appliances/{appliance_id}/technicaldetails",
+            "technical_information",
         )
         response.raise_for_status()
-        return await response.json()
+        return await self._async_decode_json(
+            "technical_information",
+            await self._async_read_body("technical_information", response),
+        )
+
+    async def async_get_consumption_data(
+        self,
+        appliance_id: str,
+        period: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict:
+        """Get the consumption data of an appliance between two local times.
+
+        The period is either daily or monthly, and determines whether a data point
+        is returned per day or per month.
+        """
+        start_string = start.strftime("%Y-%m-%d %H:%M:%S.%fZ")
+        end_string = end.strftime("%Y-%m-%d %H:%M:%S.%fZ")
+
+        response = await self._async_api_request(
+            "GET",
+            f"/appliances/{appliance_id}/energyconsumption/{period}?startDate={start_string}&endDate={end_string}",
+            "consumption",
+        )
+        response.raise_for_status()
+        return await self._async_decode_json(
+            "consumption", await self._async_read_body("consumption", response)
+        )
 
     async def async_get_consumption_data_for_today(self, appliance_id: str) -> dict:
-        """Get technical information for an appliance."""
+        """Get the consumption data of an appliance for today."""
         today = datetime.datetime.now().replace(
             hour=0, minute=0, second=0, microsecond=0
         )
         end_of_today = today + datetime.timedelta(hours=23, minutes=59, seconds=59)
 
-        today_string = today.strftime("%Y-%m-%d %H:%M:%S.%fZ")
-        end_of_today_string = end_of_today.strftime("%Y-%m-%d %H:%M:%S.%fZ")
-
-        response = await self._async_api_request(
-            "GET",
-            f"/appliances/{appliance_id}/energyconsumption/daily?startDate={today_string}&endDate={end_of_today_string}",
+        return await self.async_get_consumption_data(
+            appliance_id, "daily", today, end_of_today
         )
-        response.raise_for_status()
-        return await response.json()
+
+
+def create_client_session() -> ClientSession:
+    """Create an HTTP session for the Remeha Home API host.
+
+    Idle connections are kept alive between polls and DNS lookups are cached, so
+    most requests do not wait for a DNS lookup and a TLS handshake.
+    """
+    connector = TCPConnector(
+        ssl=ssl_util.get_default_context(),
+        limit=API_MAX_CONNECTIONS,
+        limit_per_host=API_MAX_CONNECTIONS,
+        ttl_dns_cache=API_DNS_CACHE_TTL.total_seconds(),
+        keepalive_timeout=API_KEEPALIVE_TIMEOUT.total_seconds(),
+    )
+    return ClientSession(
+        connector=connector,
+        headers={USER_AGENT: SERVER_SOFTWARE, ACCEPT_ENCODING: "gzip, deflate"},
+    )
+
+
+def create_rate_budget() -> RateBudget:
+    """Create a rate budget with the default limits of the Remeha Home API."""
+    return RateBudget(
+        READ_RATE_LIMIT, READ_RATE_LIMIT_BURST, WRITE_RATE_LIMIT, WRITE_RATE_LIMIT_BURST
+    )
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse the value of a Retry-After header into a delay in seconds."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(
+        0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    )
 
 
 class RemehaHomeAuthFailed(Exception):
     """Error to indicate that authentication failed."""
 
 
+class RemehaHomeCircuitOpen(Exception):
+    """Error to indicate that requests are not sent because the API is failing."""
+
+
+class RemehaHomeRateLimited(Exception):
+    """Error to indicate that requests are throttled by the API."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Create a rate limited error with the remaining delay in seconds."""
+        super().__init__(f"Rate limited, retry after {retry_after:.0f} seconds")
+        self.retry_after = retry_after
+
+
 class RemehaHomeOAuth2Implementation(AbstractOAuth2Implementation):
     """Custom OAuth2 implementation for the Remeha Home integration."""
 
-    def __init__(self, session: ClientSession) -> None:
+    def __init__(self, session: ClientSession, token_url: str = TOKEN_URL) -> None:
         """Create a Remeha Home OAuth2 implementation."""
         self._session = session
+        self._token_url = token_url
 
     @property
     def name(self) -> str:
@@ -296,7 +717,7 @@ class RemehaHomeOAuth2Implementation(AbstractOAuth2Implementation):
     async def _async_request_new_token(self, grant_params):
         """Call the OAuth2 token endpoint with specific grant paramters."""
         async with asyncio.timeout(30), self._session.post(
-            "https://remehalogin.bdrthermea.net/bdrb2cprod.onmicrosoft.com/oauth2/v2.0/token?p=B2C_1A_RPSignUpSignInNewRoomV3.1",
+            self._token_url,
             data=grant_params,
             allow_redirects=True,
         ) as response:
@@ -13,7 +13,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -21,6 +20,7 @@ from .const import (
     HOT_WATER_ZONE_BINARY_SENSOR_TYPES,
 )
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,8 +33,8 @@ async def async_setup_entry(
 
     entities = []
     for appliance in coordinator.data["appliances"]:
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
             for (
                 entity_description,
                 transform_func,
@@ -48,8 +48,8 @@ async def async_setup_entry(
                     )
                 )
 
-        for hot_water_zone in appliance["hotWaterZones"]:
-            hot_water_zone_id = hot_water_zone["hotWaterZoneId"]
+        for hot_water_zone in appliance.hot_water_zones:
+            hot_water_zone_id = hot_water_zone.hot_water_zone_id
             for (
                 entity_description,
                 transform_func,
@@ -66,7 +66,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class RemehaHomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class RemehaHomeBinarySensor(RemehaHomeEntity, BinarySensorEntity):
     """Representation of a binary sensor."""
 
     _attr_has_entity_name = True
@@ -79,25 +79,18 @@ class RemehaHomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
         transform_func: Callable[[str], bool],
     ) -> None:
         """Create a Remeha Home binary sensor entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (item_id, entity_description.key))
         self.entity_description = entity_description
         self.transform_func = transform_func
         self.item_id = item_id
         self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
 
-    @property
-    def _data(self):
-        """Return the appliance data for this sensor."""
-        return self.coordinator.get_by_id(self.item_id)
-
     @property
     def is_on(self) -> bool:
         """Return the measurement value for this sensor."""
-        data = self._data
-        for part in self.entity_description.key.split("."):
-            data = data[part]
-
-        return self.transform_func(data)
+        return self.transform_func(
+            self.coordinator.get_projection(self.item_id)[self.entity_description.key]
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
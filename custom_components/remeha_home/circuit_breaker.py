@@ -0,0 +1,59 @@
+"""Circuit breaker for the Remeha Home API."""
+
+from __future__ import annotations
+
+import time
+
+
+class CircuitBreaker:
+    """Circuit breaker that stops requests while the API is failing.
+
+    After `failure_threshold` consecutive failures the circuit opens. While open,
+    a single probe request is allowed every `reset_timeout` seconds. The circuit
+    closes again after any successful request.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Create a closed circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self._next_probe = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether the circuit is open."""
+        return self.consecutive_failures >= self.failure_threshold
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        if not self.is_open:
+            return "closed"
+        if time.monotonic() >= self._next_probe:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Return whether a request is allowed, reserving the probe if half open."""
+        if not self.is_open:
+            return True
+
+        now = time.monotonic()
+        if now < self._next_probe:
+            return False
+
+        self._next_probe = now + self.reset_timeout
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit at the failure threshold."""
+        self.consecutive_failures += 1
+        if self.consecutive_failures == self.failure_threshold:
+            self.open_count += 1
+            self._next_probe = time.monotonic() + self.reset_timeout
@@ -1,7 +1,9 @@
 """Platform for Remeha Home climate integration."""
 
 from __future__ import annotations
+from datetime import datetime
 from typing import Any
+import asyncio
 import logging
 
 from homeassistant.components.climate import (
@@ -12,48 +14,26 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.event import async_call_later
 
 from .api import RemehaHomeAPI
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    HVAC_MODE_TO_REMEHA_MODE,
+    PRESET_INDEX_TO_PRESET_MODE,
+    PRESET_MODE_TO_PRESET_INDEX,
+    SETPOINT_DEBOUNCE_COOLDOWN,
+)
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity, command_error
+from .models import ClimateZone
 
 _LOGGER = logging.getLogger(__name__)
 
-REMEHA_MODE_TO_HVAC_MODE = {
-    "Scheduling": HVACMode.AUTO,
-    "TemporaryOverride": HVACMode.AUTO,
-    "Manual": HVACMode.HEAT,
-    "FrostProtection": HVACMode.OFF,
-}
-
-HVAC_MODE_TO_REMEHA_MODE = {
-    HVACMode.AUTO: "Scheduling",
-    HVACMode.HEAT: "Manual",
-    HVACMode.OFF: "FrostProtection",
-}
-
-REMEHA_STATUS_TO_HVAC_ACTION = {
-    "ProducingHeat": HVACAction.HEATING,
-    "RequestingHeat": HVACAction.HEATING,
-    "Idle": HVACAction.IDLE,
-}
-
-PRESET_INDEX_TO_PRESET_MODE = {
-    1: "clock_program_1",
-    2: "clock_program_2",
-    3: "clock_program_3",
-}
-
-PRESET_MODE_TO_PRESET_INDEX = {
-    "clock_program_1": 1,
-    "clock_program_2": 2,
-    "clock_program_3": 3,
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -66,14 +46,14 @@ async def async_setup_entry(
 
     entities = []
     for appliance in coordinator.data["appliances"]:
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
             entities.append(RemehaHomeClimateEntity(api, coordinator, climate_zone_id))
 
     async_add_entities(entities)
 
 
-class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
+class RemehaHomeClimateEntity(RemehaHomeEntity, ClimateEntity):
     """Climate entity representing a Remeha Home climate zone."""
 
     _enable_turn_on_off_backwards_compatibility = False
@@ -96,18 +76,32 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
         climate_zone_id: str,
     ) -> None:
         """Create a Remeha Home climate entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, climate_zone_id)
         self.api = api
         self.coordinator = coordinator
         self.climate_zone_id = climate_zone_id
 
         self._attr_unique_id = "_".join([DOMAIN, self.climate_zone_id])
 
+        # Commands for this climate zone are sent one at a time, so they are
+        # applied in the order they were requested
+        self._command_lock = asyncio.Lock()
+        # The last requested setpoint that is not sent yet, with the future that
+        # is resolved once it has been sent
+        self._pending_target_temperature: float | None = None
+        self._pending_target_temperature_sent: asyncio.Future[None] | None = None
+        self._unsub_setpoint_timer: CALLBACK_TYPE | None = None
+
     @property
-    def _data(self) -> dict:
+    def _data(self) -> ClimateZone:
         """Return the climate zone information from the coordinator."""
         return self.coordinator.get_by_id(self.climate_zone_id)
 
+    @property
+    def _projection(self) -> dict:
+        """Return the precomputed climate zone values from the coordinator."""
+        return self.coordinator.get_projection(self.climate_zone_id)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device info for this device."""
@@ -116,30 +110,27 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        return self._data["roomTemperature"]
+        return self._data.room_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
-        if self.hvac_mode == HVACMode.OFF:
-            return None
-        return self._data["setPoint"]
+        return self._projection["target_temperature"]
 
     @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
-        return self._data["setPointMin"]
+        return self._data.set_point_min
 
     @property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
-        return self._data["setPointMax"]
+        return self._data.set_point_max
 
     @property
     def hvac_mode(self) -> HVACMode | str | None:
         """Return hvac target hvac state."""
-        mode = self._data["zoneMode"]
-        return REMEHA_MODE_TO_HVAC_MODE.get(mode)
+        return self._projection["hvac_mode"]
 
     @property
     def hvac_modes(self) -> list[HVACMode] | list[str]:
@@ -149,66 +140,136 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
     @property
     def hvac_action(self) -> HVACAction | str | None:
         """Return hvac action."""
-        if self.hvac_mode == HVACMode.OFF:
-            return HVACAction.OFF
-
-        action = self._data["activeComfortDemand"]
-        return REMEHA_STATUS_TO_HVAC_ACTION.get(action)
+        return self._projection["hvac_action"]
 
     @property
     def preset_mode(self) -> str | None:
         """Return the preset mode."""
-        if self.hvac_mode == HVACMode.OFF:
-            return "anti_frost"
-        if self.hvac_mode == HVACMode.HEAT:
-            return "manual"
-        return PRESET_INDEX_TO_PRESET_MODE[
-            self._data["activeHeatingClimateTimeProgramNumber"]
-        ]
+        return self._projection["preset_mode"]
 
     @property
     def preset_modes(self) -> list[str]:
         """Return the list of available presets."""
         return list(PRESET_INDEX_TO_PRESET_MODE.values())
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel sending a pending setpoint when the entity is removed."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_setpoint_timer is not None:
+            self._unsub_setpoint_timer()
+            self._unsub_setpoint_timer = None
+        if (sent := self._pending_target_temperature_sent) is not None:
+            self._pending_target_temperature = None
+            self._pending_target_temperature_sent = None
+            sent.set_exception(
+                HomeAssistantError("The entity was removed before sending the setpoint")
+            )
+
     async def async_set_temperature(self, **kwargs: Any) -> None:
-        """Set new target temperature."""
+        """Set new target temperature.
+
+        The setpoint is sent once no other setpoint has been requested for
+        SETPOINT_DEBOUNCE_COOLDOWN seconds, so rapid changes are sent as one
+        request with the last temperature. Setpoints requested while a request
+        is in progress are sent after it. The call returns when the requested
+        setpoint, or a later one, has been sent, and fails if sending it failed.
+        """
         if (temperature := kwargs.get(ATTR_TEMPERATURE)) is not None:
             _LOGGER.debug("Setting temperature to %f", temperature)
-            if self.hvac_mode == HVACMode.AUTO:
-                await self.api.async_set_temporary_override(
-                    self.climate_zone_id, temperature
-                )
-            elif self.hvac_mode == HVACMode.HEAT:
-                await self.api.async_set_manual(self.climate_zone_id, temperature)
-            elif self.hvac_mode == HVACMode.OFF:
+            if self.hvac_mode == HVACMode.OFF:
                 return
 
-            await self.coordinator.async_request_refresh()
+            # Show the new setpoint until a poll confirms it
+            self._pending_target_temperature = temperature
+            self.coordinator.async_set_pending(
+                self.climate_zone_id, {"setPoint": temperature}
+            )
+            if self._pending_target_temperature_sent is None:
+                self._pending_target_temperature_sent = self.hass.loop.create_future()
+            sent = self._pending_target_temperature_sent
+
+            # Restart the timer, so the setpoint is sent after the last change
+            if self._unsub_setpoint_timer is not None:
+                self._unsub_setpoint_timer()
+            self._unsub_setpoint_timer = async_call_later(
+                self.hass,
+                SETPOINT_DEBOUNCE_COOLDOWN,
+                HassJob(
+                    self._async_send_target_temperature,
+                    f"{DOMAIN} send setpoint {self.climate_zone_id}",
+                    cancel_on_shutdown=True,
+                ),
+            )
+
+            # Other calls wait for the same send, so do not cancel it with this one
+            await asyncio.shield(sent)
+
+    async def _async_send_target_temperature(self, _now: datetime) -> None:
+        """Send the requested target temperatures to the API until none is pending."""
+        self._unsub_setpoint_timer = None
+        async with self._command_lock:
+            while (temperature := self._pending_target_temperature) is not None:
+                sent = self._pending_target_temperature_sent
+                self._pending_target_temperature = None
+                self._pending_target_temperature_sent = None
+
+                try:
+                    with self.coordinator.tracer.trace(
+                        "set_temperature", entity_id=self.entity_id
+                    ):
+                        if self.hvac_mode == HVACMode.AUTO:
+                            await self.api.async_set_temporary_override(
+                                self.climate_zone_id, temperature
+                            )
+                        elif self.hvac_mode == HVACMode.HEAT:
+                            await self.api.async_set_manual(
+                                self.climate_zone_id, temperature
+                            )
+                except Exception as err:
+                    _LOGGER.error(
+                        "Failed to set the temperature of climate zone %s to %s: %s",
+                        self.climate_zone_id,
+                        temperature,
+                        err,
+                    )
+                    self.coordinator.async_clear_pending(
+                        self.climate_zone_id, {"setPoint": temperature}
+                    )
+                    sent.set_exception(command_error(err))
+                else:
+                    sent.set_result(None)
+                finally:
+                    # The send was cancelled, when Home Assistant stops
+                    if not sent.done():
+                        sent.cancel()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new operation mode."""
         _LOGGER.debug("Setting operation mode to %s", hvac_mode)
 
-        # Temporarily override the coordinator state until the next poll
-        self._data["zoneMode"] = HVAC_MODE_TO_REMEHA_MODE.get(hvac_mode)
-        self.async_write_ha_state()
-
-        if hvac_mode == HVACMode.AUTO:
-            await self.api.async_set_schedule(
-                self.climate_zone_id,
-                self._data["activeHeatingClimateTimeProgramNumber"],
-            )
-        elif hvac_mode == HVACMode.HEAT:
-            await self.api.async_set_manual(
-                self.climate_zone_id, self._data["setPoint"]
-            )
-        elif hvac_mode == HVACMode.OFF:
-            await self.api.async_set_off(self.climate_zone_id)
-        else:
-            raise NotImplementedError()
-
-        await self.coordinator.async_request_refresh()
+        with self.coordinator.tracer.trace(
+            "set_hvac_mode", entity_id=self.entity_id, hvac_mode=hvac_mode
+        ):
+            async with self._command_lock:
+                if hvac_mode == HVACMode.AUTO:
+                    command = self.api.async_set_schedule(
+                        self.climate_zone_id,
+                        self._data.active_heating_climate_time_program_number,
+                    )
+                elif hvac_mode == HVACMode.HEAT:
+                    command = self.api.async_set_manual(
+                        self.climate_zone_id, self._data.set_point
+                    )
+                elif hvac_mode == HVACMode.OFF:
+                    command = self.api.async_set_off(self.climate_zone_id)
+                else:
+                    raise NotImplementedError()
+
+                await self.async_send_command(
+                    self.climate_zone_id,
+                    {"zoneMode": HVAC_MODE_TO_REMEHA_MODE.get(hvac_mode)},
+                    command,
+                )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
@@ -219,18 +280,31 @@ class RemehaHomeClimateEntity(CoordinatorEntity, ClimateEntity):
             return
 
         target_preset = PRESET_MODE_TO_PRESET_INDEX[preset_mode]
-        previous_hvac_mode = self.hvac_mode
 
-        self._data["zoneMode"] = HVAC_MODE_TO_REMEHA_MODE.get(HVACMode.AUTO)
-        self._data["activeHeatingClimateTimeProgramNumber"] = target_preset
-        self.async_write_ha_state()
+        with self.coordinator.tracer.trace(
+            "set_preset_mode", entity_id=self.entity_id, preset_mode=preset_mode
+        ):
+            async with self._command_lock:
+                # A temporary override also maps to auto mode, and is kept
+                set_schedule = self.hvac_mode != HVACMode.AUTO
+                values = {"activeHeatingClimateTimeProgramNumber": target_preset}
+                if set_schedule:
+                    values["zoneMode"] = HVAC_MODE_TO_REMEHA_MODE.get(HVACMode.AUTO)
+
+                await self.async_send_command(
+                    self.climate_zone_id,
+                    values,
+                    self._async_activate_preset(target_preset, set_schedule),
+                )
 
+    async def _async_activate_preset(
+        self, target_preset: int, set_schedule: bool
+    ) -> None:
+        """Activate a heating time program, switching to schedule mode if needed."""
         # Switch the selected heating time program
         await self.api.async_activate_heating_time_program(
             self.climate_zone_id, target_preset
         )
         # Automatically make sure the mode is set to schedule
-        if previous_hvac_mode != HVACMode.AUTO:
+        if set_schedule:
             await self.api.async_set_schedule(self.climate_zone_id, target_preset)
-
-        await self.coordinator.async_request_refresh()
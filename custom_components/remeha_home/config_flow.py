@@ -20,6 +20,8 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
     """Config flow to handle RemehaHome authentication."""
 
     DOMAIN = DOMAIN
+    VERSION = 1
+    MINOR_VERSION = 2
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
     def __init__(self):
@@ -49,8 +51,6 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None):
         """Handle a flow start."""
-        await self.async_set_unique_id(DOMAIN)
-
         self.async_register_implementation(
             self.hass,
             RemehaHomeOAuth2Implementation(async_get_clientsession(self.hass)),
@@ -89,10 +89,15 @@ class RemehaHomeLoginFlowHandler(AbstractOAuth2FlowHandler, domain=DOMAIN):
 
     async def async_oauth_create_entry(self, data: dict) -> dict:
         """Create an oauth config entry or update existing entry for reauth."""
-        existing_entry = await self.async_set_unique_id(DOMAIN)
-        if existing_entry:
-            self.hass.config_entries.async_update_entry(existing_entry, data=data)
-            await self.hass.config_entries.async_reload(existing_entry.entry_id)
-            return self.async_abort(reason="reauth_successful")
+        email = self.external_data["email"]
+        data = {**data, CONF_EMAIL: email}
+        # Each Remeha Home account gets its own config entry
+        await self.async_set_unique_id(email.lower())
+        if self.source == config_entries.SOURCE_REAUTH:
+            self._abort_if_unique_id_mismatch(reason="wrong_account")
+            return self.async_update_reload_and_abort(
+                self._get_reauth_entry(), data=data
+            )
+        self._abort_if_unique_id_configured()
 
-        return self.async_create_entry(title=self.external_data["email"], data=data)
+        return self.async_create_entry(title=email, data=data)
@@ -1,5 +1,7 @@
 """Constants for the Remeha Home integration."""
 
+from datetime import timedelta
+
 from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorDeviceClass,
@@ -9,10 +11,166 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
     BinarySensorDeviceClass,
 )
-from homeassistant.const import UnitOfEnergy, UnitOfTemperature, UnitOfPressure
+from homeassistant.components.climate import HVACAction, HVACMode
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfPressure,
+    UnitOfTime,
+)
 
 DOMAIN = "remeha_home"
 
+API_BASE_URL = "https://api.bdrthermea.net/Mobile/api"
+TOKEN_URL = "https://remehalogin.bdrthermea.net/bdrb2cprod.onmicrosoft.com/oauth2/v2.0/token?p=B2C_1A_RPSignUpSignInNewRoomV3.1"
+
+# Time before the expiry of the access token at which it is refreshed in
+# advance, with a random jitter of up to TOKEN_REFRESH_JITTER
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+TOKEN_REFRESH_JITTER = timedelta(minutes=1)
+
+# Delay in seconds after the last setpoint change before it is sent to the API
+SETPOINT_DEBOUNCE_COOLDOWN = 1.0
+
+# Request budgets in requests per second, with the maximum burst size, for
+# reading data and for sending commands
+READ_RATE_LIMIT = 0.5
+READ_RATE_LIMIT_BURST = 20
+WRITE_RATE_LIMIT = 0.5
+WRITE_RATE_LIMIT_BURST = 5
+
+# Retrying of throttled requests and transient server errors, delays are in
+# seconds. Requests are not delayed longer than MAX_RETRY_DELAY.
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+MAX_REQUEST_RETRIES = 3
+RETRY_BACKOFF_BASE = 1.0
+MAX_RETRY_DELAY = 10.0
+
+# Timeout for a single API request
+REQUEST_TIMEOUT = timedelta(seconds=15)
+
+# Connection pool for the API host, shared by all accounts. Idle connections are
+# kept alive for API_KEEPALIVE_TIMEOUT. Before a poll after a longer interval a
+# connection is opened API_PREWARM_LEAD in advance, so the poll does not wait
+# for the TLS handshake.
+API_MAX_CONNECTIONS = 8
+API_KEEPALIVE_TIMEOUT = timedelta(seconds=90)
+API_DNS_CACHE_TTL = timedelta(minutes=10)
+API_PREWARM_LEAD = timedelta(seconds=5)
+
+# Number of consecutive failed requests after which requests are stopped, and
+# the interval at which a single probe request is allowed while stopped
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+CIRCUIT_BREAKER_RESET_TIMEOUT = timedelta(minutes=2)
+
+# Maximum age of the data that is shown while the API cannot be reached,
+# before the entities become unavailable
+DEFAULT_MAX_DATA_AGE = timedelta(hours=1)
+
+# Response bodies larger than this number of bytes are decoded in the executor
+JSON_EXECUTOR_THRESHOLD = 256 * 1024
+
+# Number of traces of refreshes and commands kept for the diagnostics
+TRACE_BUFFER_SIZE = 50
+
+# Keys of the request budget and of the HTTP session for the API host, both
+# shared by all config entries, in hass.data
+DATA_RATE_BUDGET = f"{DOMAIN}_rate_budget"
+DATA_CLIENT_SESSION = f"{DOMAIN}_client_session"
+
+# Consumption is polled separately from the dashboard, shortly after each
+# interval at which the cloud aggregates it
+CONSUMPTION_UPDATE_INTERVAL = timedelta(minutes=15)
+CONSUMPTION_UPDATE_DELAY = timedelta(minutes=1)
+CONSUMPTION_UPDATE_TIMEOUT = timedelta(seconds=60)
+
+# Storage for the technical information of appliances, which rarely changes
+TECHNICAL_INFO_STORAGE_KEY = f"{DOMAIN}.technical_info"
+TECHNICAL_INFO_STORAGE_VERSION = 1
+
+# Import of the consumption history into long-term statistics. The daily history
+# is requested in chunks of days, with a limited number of concurrent requests.
+ENERGY_BACKFILL_CHUNK_DAYS = 31
+ENERGY_BACKFILL_MAX_CONCURRENT_REQUESTS = 2
+ENERGY_BACKFILL_MAX_YEARS = 5
+# Days missing from the history within this many days of yesterday may still be
+# published later, so the import waits for them. Older missing days are skipped.
+ENERGY_BACKFILL_SETTLE_DAYS = 3
+ENERGY_BACKFILL_STORAGE_KEY = f"{DOMAIN}.energy_backfill"
+ENERGY_BACKFILL_STORAGE_VERSION = 1
+
+# Energy efficiency analytics over the imported daily history. Rolling values
+# cover ANALYTICS_ROLLING_DAYS, which are compared to the same days a year
+# earlier. Windows with less than the minimum coverage of days with data are
+# not used. Heating degree days are counted below the base temperature in °C.
+ANALYTICS_ROLLING_DAYS = 30
+ANALYTICS_DAYS_PER_YEAR = 365
+ANALYTICS_HISTORY_DAYS = ANALYTICS_ROLLING_DAYS + ANALYTICS_DAYS_PER_YEAR
+ANALYTICS_MIN_COVERAGE = 0.5
+HEATING_DEGREE_DAY_BASE = 18.0
+
+# Storage for the data of the last successful update, used to create the
+# entities without waiting for the first update
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+
+# Maximum number of per-appliance requests that are in flight at the same time
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Polling interval used while any zone is active, and the interval that is
+# gradually backed off to while the house is idle or offline
+DEFAULT_MIN_UPDATE_INTERVAL = timedelta(seconds=60)
+DEFAULT_MAX_UPDATE_INTERVAL = timedelta(minutes=15)
+
+# Known transitions in the dashboard, such as the next switch time of a zone or
+# the end of a temporary override, are refreshed this long after they happen
+TRANSITION_REFRESH_DELAY = timedelta(seconds=15)
+
+# Values set by commands are shown until a poll confirms them, or rolled back
+# after this timeout. A poll is made within the minimum interval after a command.
+PENDING_INTENT_TIMEOUT = timedelta(minutes=5)
+
+# Service profiling the next refreshes of the coordinators, with the number of
+# entries in the reported hotspots and allocation sites
+SERVICE_PROFILE = "profile"
+PROFILE_DEFAULT_REFRESHES = 3
+PROFILE_MAX_REFRESHES = 20
+PROFILE_TOP_ENTRIES = 20
+
+REMEHA_MODE_TO_HVAC_MODE = {
+    "Scheduling": HVACMode.AUTO,
+    "TemporaryOverride": HVACMode.AUTO,
+    "Manual": HVACMode.HEAT,
+    "FrostProtection": HVACMode.OFF,
+}
+
+HVAC_MODE_TO_REMEHA_MODE = {
+    HVACMode.AUTO: "Scheduling",
+    HVACMode.HEAT: "Manual",
+    HVACMode.OFF: "FrostProtection",
+}
+
+REMEHA_STATUS_TO_HVAC_ACTION = {
+    "ProducingHeat": HVACAction.HEATING,
+    "RequestingHeat": HVACAction.HEATING,
+    "Idle": HVACAction.IDLE,
+}
+
+PRESET_INDEX_TO_PRESET_MODE = {
+    1: "clock_program_1",
+    2: "clock_program_2",
+    3: "clock_program_3",
+}
+
+PRESET_MODE_TO_PRESET_INDEX = {
+    "clock_program_1": 1,
+    "clock_program_2": 2,
+    "clock_program_3": 3,
+}
+
 APPLIANCE_SENSOR_TYPES = [
     SensorEntityDescription(
         key="waterPressure",
@@ -36,6 +194,10 @@ APPLIANCE_SENSOR_TYPES = [
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
+]
+
+# The consumption sensors are updated by the consumption coordinator
+APPLIANCE_CONSUMPTION_SENSOR_TYPES = [
     SensorEntityDescription(
         key="consumptionData.heatingEnergyConsumed",
         name="Heating Energy Consumed",
@@ -86,6 +248,38 @@ APPLIANCE_SENSOR_TYPES = [
     ),
 ]
 
+# The analytics sensors are updated by the analytics coordinator, once a day
+APPLIANCE_ANALYTICS_SENSOR_TYPES = [
+    SensorEntityDescription(
+        key="cop_daily",
+        name="COP Yesterday",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="cop_rolling",
+        name=f"COP {ANALYTICS_ROLLING_DAYS} Days",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="heating_energy_per_degree_day",
+        name="Heating Energy per Degree Day",
+        native_unit_of_measurement=(
+            f"{UnitOfEnergy.KILO_WATT_HOUR}/{UnitOfTemperature.CELSIUS}·d"
+        ),
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="consumption_year_over_year",
+        name="Consumption Year over Year",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+]
+
 CLIMATE_ZONE_SENSOR_TYPES = [
     SensorEntityDescription(
         key="nextSetpoint",
@@ -121,6 +315,63 @@ HOT_WATER_ZONE_SENSOR_TYPES = [
     ),
 ]
 
+# Diagnostic sensors for the request and refresh metrics of a config entry
+METRICS_SENSOR_TYPES = [
+    SensorEntityDescription(
+        key="api_requests",
+        name="API Requests",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="api_errors",
+        name="API Errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="api_bytes_received",
+        name="API Bytes Received",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="api_latency_mean",
+        name="API Latency",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="api_latency_p95",
+        name="API Latency 95th Percentile",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh Duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+]
+
 CLIMATE_ZONE_BINARY_SENSOR_TYPES = [
     (
         BinarySensorEntityDescription(
@@ -1,52 +1,450 @@
 """Coordinator for fetching the Remeha Home data."""
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import logging
+import time
+from typing import Any
 
 import asyncio
-from aiohttp.client_exceptions import ClientResponseError
+from aiohttp.client_exceptions import ClientError, ClientResponseError
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components.climate import HVACAction, HVACMode
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryAuthFailed
+import homeassistant.util.dt as dt_util
 
-from .api import RemehaHomeAPI
-from .const import DOMAIN
+from .api import RemehaHomeAPI, RemehaHomeCircuitOpen, RemehaHomeRateLimited
+from .energy_analytics import (
+    appliance_statistic_ids,
+    compute_appliance_analytics,
+    history_period,
+)
+from .metrics import RefreshMetrics
+from .profiler import RemehaHomeProfiler
+from .models import (
+    Appliance,
+    ClimateZone,
+    HotWaterZone,
+    RemehaHomeInvalidData,
+    RemehaHomeModel,
+    dashboard_as_dict,
+    parse_dashboard,
+)
+from .const import (
+    ANALYTICS_HISTORY_DAYS,
+    API_KEEPALIVE_TIMEOUT,
+    API_PREWARM_LEAD,
+    APPLIANCE_SENSOR_TYPES,
+    CLIMATE_ZONE_BINARY_SENSOR_TYPES,
+    CLIMATE_ZONE_SENSOR_TYPES,
+    CONSUMPTION_UPDATE_DELAY,
+    CONSUMPTION_UPDATE_INTERVAL,
+    CONSUMPTION_UPDATE_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+    HOT_WATER_ZONE_BINARY_SENSOR_TYPES,
+    HOT_WATER_ZONE_SENSOR_TYPES,
+    PENDING_INTENT_TIMEOUT,
+    PRESET_INDEX_TO_PRESET_MODE,
+    REMEHA_MODE_TO_HVAC_MODE,
+    REMEHA_STATUS_TO_HVAC_ACTION,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    TECHNICAL_INFO_STORAGE_KEY,
+    TECHNICAL_INFO_STORAGE_VERSION,
+    TRANSITION_REFRESH_DELAY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+EMPTY_CONSUMPTION_DATA = {
+    "heatingEnergyConsumed": 0.0,
+    "hotWaterEnergyConsumed": 0.0,
+    "coolingEnergyConsumed": 0.0,
+    "heatingEnergyDelivered": 0.0,
+    "hotWaterEnergyDelivered": 0.0,
+    "coolingEnergyDelivered": 0.0,
+}
+
+ACTIVE_COMFORT_DEMANDS = ("ProducingHeat", "RequestingHeat")
+
+UNKNOWN_TECHNICAL_INFO = {
+    "applianceName": "Unknown",
+    "internetConnectedGateways": [],
+}
+
+
+def _compile_key_paths(entity_descriptions) -> list[tuple[str, list[str], bool]]:
+    """Return the key, the split key path and if it is a timestamp for each entity."""
+    return [
+        (
+            entity_description.key,
+            entity_description.key.split("."),
+            entity_description.device_class == SensorDeviceClass.TIMESTAMP,
+        )
+        for entity_description in entity_descriptions
+    ]
+
+
+APPLIANCE_KEY_PATHS = _compile_key_paths(APPLIANCE_SENSOR_TYPES)
+CLIMATE_ZONE_KEY_PATHS = _compile_key_paths(
+    [
+        *CLIMATE_ZONE_SENSOR_TYPES,
+        *(description for description, _ in CLIMATE_ZONE_BINARY_SENSOR_TYPES),
+    ]
+)
+HOT_WATER_ZONE_KEY_PATHS = _compile_key_paths(
+    [
+        *HOT_WATER_ZONE_SENSOR_TYPES,
+        *(description for description, _ in HOT_WATER_ZONE_BINARY_SENSOR_TYPES),
+    ]
+)
+
+
+def _project_key_paths(item: RemehaHomeModel, key_paths) -> dict:
+    """Resolve the values of the key paths in an item."""
+    projection = {}
+    for key, parts, is_timestamp in key_paths:
+        value = item
+        for part in parts:
+            # If the key is missing for some reason, don't crash, instead use None
+            if value is None or part not in value:
+                _LOGGER.warning("Key not found in data: %s", key)
+                value = None
+                break
+            value = value[part]
+
+        if is_timestamp:
+            value = _parse_time(value)
+
+        projection[key] = value
+    return projection
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """Parse a time in the dashboard, which is in the local time zone.
+
+    The API uses the first day of year 1 when there is no time.
+    """
+    if not value or (time_value := dt_util.parse_datetime(value)) is None:
+        return None
+    if time_value.year == 1:
+        return None
+    return time_value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+def _project_appliance(appliance: Appliance) -> dict:
+    """Resolve the values of an appliance."""
+    return _project_key_paths(appliance, APPLIANCE_KEY_PATHS)
+
+
+def _project_hot_water_zone(hot_water_zone: HotWaterZone) -> dict:
+    """Resolve the values of a hot water zone."""
+    return _project_key_paths(hot_water_zone, HOT_WATER_ZONE_KEY_PATHS)
+
+
+def _project_climate_zone(climate_zone: ClimateZone) -> dict:
+    """Resolve the values of a climate zone, including the climate entity state."""
+    projection = _project_key_paths(climate_zone, CLIMATE_ZONE_KEY_PATHS)
+
+    hvac_mode = REMEHA_MODE_TO_HVAC_MODE.get(climate_zone.zone_mode)
+    projection["hvac_mode"] = hvac_mode
+    if hvac_mode == HVACMode.OFF:
+        projection["target_temperature"] = None
+        projection["hvac_action"] = HVACAction.OFF
+        projection["preset_mode"] = "anti_frost"
+    else:
+        projection["target_temperature"] = climate_zone.set_point
+        projection["hvac_action"] = REMEHA_STATUS_TO_HVAC_ACTION.get(
+            climate_zone.active_comfort_demand
+        )
+        if hvac_mode == HVACMode.HEAT:
+            projection["preset_mode"] = "manual"
+        else:
+            projection["preset_mode"] = PRESET_INDEX_TO_PRESET_MODE.get(
+                climate_zone.active_heating_climate_time_program_number
+            )
+    return projection
+
 
 class RemehaHomeUpdateCoordinator(DataUpdateCoordinator):
     """Remeha Home update coordinator."""
 
-    def __init__(self, hass: HomeAssistant, api: RemehaHomeAPI) -> None:
-        """Initialize Remeha Home update coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: RemehaHomeAPI,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        min_update_interval: timedelta = DEFAULT_MIN_UPDATE_INTERVAL,
+        max_update_interval: timedelta = DEFAULT_MAX_UPDATE_INTERVAL,
+        max_data_age: timedelta = DEFAULT_MAX_DATA_AGE,
+        config_entry: ConfigEntry | None = None,
+        poll_offset: timedelta = timedelta(0),
+    ) -> None:
+        """Initialize Remeha Home update coordinator.
+
+        The poll offset delays the first scheduled poll, so the coordinators of
+        multiple accounts do not poll at the same time.
+        """
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),
+            update_interval=min_update_interval,
         )
+        self._poll_offset = poll_offset
+        self.min_update_interval = min_update_interval
+        self.max_update_interval = max_update_interval
+        self.max_data_age = max_data_age
+        self.last_successful_update: datetime | None = None
         self.api = api
         self.items = {}
+        self.projections = {}
+        self._projectors = {}
         self.device_info = {}
+        self._device_info_inputs = {}
         self.technical_info = {}
-        self.appliance_consumption_data = {}
-        self.appliance_last_consumption_data_update = {}
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        # Each account has its own storage, so multiple entries do not overwrite it
+        storage_suffix = f".{config_entry.entry_id}" if config_entry else ""
+        self._technical_info_store = Store(
+            hass,
+            TECHNICAL_INFO_STORAGE_VERSION,
+            TECHNICAL_INFO_STORAGE_KEY + storage_suffix,
+        )
+        self._unvalidated_technical_info: set[str] = set()
+        self._snapshot_store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY + storage_suffix
+        )
+        self.data_is_stale = False
+        self._last_snapshot_save: datetime | None = None
+        self.changed_keys: dict[str, set[str]] | None = None
+        self._changed_keys: dict[str, set[str]] = {}
+        # Values set by commands by item id and API key, with their deadline
+        self._pending: dict[str, dict[str, tuple[Any, float]]] = {}
+        self._overlaid_items: dict[str, RemehaHomeModel] = {}
+        self._unsub_pending_expiry: CALLBACK_TYPE | None = None
+        self._unsub_data_expiry: CALLBACK_TYPE | None = None
+        self._unsub_prewarm: CALLBACK_TYPE | None = None
+        # Refresh scheduled in addition to the polls, at a known transition or
+        # to confirm a command
+        self._unsub_one_shot_refresh: CALLBACK_TYPE | None = None
+        self._one_shot_refresh_time: datetime | None = None
+        self.refresh_metrics = RefreshMetrics()
+        self.tracer = api.tracer
+        # Profiler of the next refreshes, set by the profile service
+        self.profiler: RemehaHomeProfiler | None = None
+
+    async def async_load_technical_info(self) -> None:
+        """Load the appliance technical information stored by a previous run.
+
+        The stored information is used immediately and revalidated in the
+        background once the appliance is seen in the dashboard.
+        """
+        if (stored := await self._technical_info_store.async_load()) is None:
+            return
+
+        for appliance_id, technical_info in stored.items():
+            if appliance_id not in self.technical_info:
+                self.technical_info[appliance_id] = technical_info
+                self._unvalidated_technical_info.add(appliance_id)
+
+    async def async_load_snapshot(self) -> bool:
+        """Restore the data from the last successful update stored by a previous run.
+
+        Returns whether a snapshot was restored. The restored data is marked as
+        stale until the next successful update. Its age counts from the update it
+        was saved after, so it is served while updates fail until it gets older
+        than the maximum data age.
+        """
+        if (stored := await self._snapshot_store.async_load()) is None:
+            return False
+
+        # Snapshots saved by older versions only contain the dashboard
+        if "dashboard" not in stored:
+            stored = {"updated": None, "dashboard": stored}
+
+        try:
+            data = parse_dashboard(stored["dashboard"])
+        except RemehaHomeInvalidData as err:
+            _LOGGER.warning("Ignoring invalid stored snapshot: %s", err)
+            return False
+
+        self._build_index(data)
+        self.data = data
+        self.data_is_stale = True
+        if stored["updated"] is not None:
+            self.last_successful_update = datetime.fromtimestamp(stored["updated"])
+            self._schedule_data_expiry()
+        return True
+
+    @callback
+    def _async_save_snapshot(self, data: dict, updated: datetime) -> None:
+        """Schedule saving the data from the last successful update to storage.
+
+        To limit the number of writes, the snapshot is saved at most once every
+        15 minutes.
+        """
+        now = datetime.now()
+        if (
+            self._last_snapshot_save is not None
+            and now - self._last_snapshot_save < timedelta(minutes=15)
+        ):
+            return
+
+        self._last_snapshot_save = now
+        self._snapshot_store.async_delay_save(
+            lambda: {
+                "updated": updated.timestamp(),
+                "dashboard": dashboard_as_dict(data),
+            },
+            10,
+        )
+
+    @callback
+    def _async_save_technical_info(self) -> None:
+        """Schedule saving the appliance technical information to storage."""
+        self._technical_info_store.async_delay_save(lambda: self.technical_info, 10)
+
+    async def _async_revalidate_technical_info(self, appliance_id: str) -> None:
+        """Request the technical information of an appliance loaded from storage."""
+        try:
+            async with self._request_semaphore:
+                technical_info = (
+                    await self.api.async_get_appliance_technical_information(
+                        appliance_id
+                    )
+                )
+        except (
+            ClientError,
+            asyncio.TimeoutError,
+            RemehaHomeCircuitOpen,
+            RemehaHomeRateLimited,
+        ) as err:
+            _LOGGER.debug(
+                "Failed to revalidate technical information for appliance %s: %s",
+                appliance_id,
+                err,
+            )
+            return
+
+        if technical_info != self.technical_info.get(appliance_id):
+            _LOGGER.debug(
+                "Technical information for appliance %s changed: %s",
+                appliance_id,
+                technical_info,
+            )
+            self.technical_info[appliance_id] = technical_info
+            self._async_save_technical_info()
+            # Update the models and versions of the devices of the appliance
+            if self.data is not None:
+                self._build_index(self.data)
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh the data, tracing it and profiling it when a profile was requested.
+
+        The refresh includes the update of the listeners, so the trace and the
+        profile contain the entity updates triggered by the refresh.
+        """
+        with self.tracer.trace("refresh"):
+            previous_update_success = self.last_update_success
+            if (profiler := self.profiler) is None:
+                await super()._async_refresh(*args, **kwargs)
+            else:
+                with profiler.profile_refresh(self):
+                    await super()._async_refresh(*args, **kwargs)
+
+            # The listeners are not notified of consecutive failures, while the
+            # age of the data they show keeps increasing
+            if not previous_update_success and not self.last_update_success:
+                self.changed_keys = None
+                self.async_update_listeners()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Schedule opening a connection shortly before the next poll.
+
+        When the next poll is within the keep-alive timeout, the idle connection of
+        this poll is reused instead.
+        """
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+
+        if (
+            self.update_interval is None
+            or self.update_interval <= API_KEEPALIVE_TIMEOUT
+        ):
+            return
+
+        self._unsub_prewarm = async_call_later(
+            self.hass,
+            self.update_interval - API_PREWARM_LEAD,
+            HassJob(self._async_prewarm_connection, cancel_on_shutdown=True),
+        )
+
+    async def _async_prewarm_connection(self, _now: datetime) -> None:
+        """Open a connection to the API for the next poll."""
+        self._unsub_prewarm = None
+        await self.api.async_prewarm_connection()
+
+    @contextmanager
+    def _phase(self, phase: str) -> Iterator[None]:
+        """Measure the duration of a refresh phase and trace it as a span."""
+        with self.refresh_metrics.measure(phase), self.tracer.span(phase):
+            yield
 
     async def _async_update_data(self):
+        """Fetch data from API endpoint, recording the duration of the update."""
+        with self._phase("total"):
+            return await self._async_update_dashboard()
+
+    async def _async_update_dashboard(self):
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        # Notify all listeners if this update fails, the previous one failed or the
+        # current data was restored from a snapshot
+        self.changed_keys = None
+        self._changed_keys = {}
+        previous_update_success = self.last_update_success
+
+        # Save the current time for appliance usage data updates
+        now = datetime.now()
+
+        # An unchanged dashboard can only be skipped if no appliance needs
+        # additional information to be requested
+        only_if_changed = self.data is not None and all(
+            appliance.appliance_id in self.technical_info
+            for appliance in self.data["appliances"]
+        )
+
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
             async with asyncio.timeout(30):
-                data = await self.api.async_get_dashboard()
-                _LOGGER.debug("Requested dashboard information: %s", data)
+                with self._phase("dashboard"):
+                    raw_data = await self.api.async_get_dashboard(only_if_changed)
         except ClientResponseError as err:
             # Raising ConfigEntryAuthFailed will cancel future updates
             # and start a config flow with SOURCE_REAUTH (async_step_reauth)
@@ -54,97 +452,108 @@ class RemehaHomeUpdateCoordinator(DataUpdateCoordinator):
                 raise ConfigEntryAuthFailed from err
 
             raise UpdateFailed from err
+        except RemehaHomeCircuitOpen as err:
+            raise UpdateFailed("Remeha Home API is unavailable") from err
+        except RemehaHomeRateLimited as err:
+            raise UpdateFailed(str(err)) from err
 
-        # Save the current time for appliance usage data updates
-        now = datetime.now()
+        if raw_data is None:
+            # The dashboard is identical to the previous one, so keep the current
+            # data and do not notify any of the listeners
+            _LOGGER.debug("Dashboard information is unchanged")
+            self._adjust_update_interval(self.data)
+            self._schedule_transition_refresh(self.data)
+            self.last_successful_update = now
+            self._schedule_data_expiry()
+            if previous_update_success:
+                self.changed_keys = {}
+            return self.data
 
-        for appliance in data["appliances"]:
-            appliance_id = appliance["applianceId"]
-            self.items[appliance_id] = appliance
+        try:
+            with self._phase("parse"):
+                data = parse_dashboard(raw_data)
+        except RemehaHomeInvalidData as err:
+            raise UpdateFailed(str(err)) from err
 
-            # Request appliance technical information the first time it is discovered
-            if appliance_id not in self.technical_info:
-                self.technical_info[appliance_id] = (
-                    await self.api.async_get_appliance_technical_information(
-                        appliance_id
-                    )
-                )
-                _LOGGER.debug(
-                    "Requested technical information for appliance %s: %s",
-                    appliance_id,
-                    self.technical_info[appliance_id],
+        # Request the secondary information for all appliances concurrently, a
+        # failure for one appliance should not prevent the others from updating
+        with self._phase("appliances"):
+            results = await asyncio.gather(
+                *(
+                    self._async_update_appliance(appliance.appliance_id)
+                    for appliance in data["appliances"]
+                ),
+                return_exceptions=True,
+            )
+        for appliance, result in zip(data["appliances"], results):
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "Failed to update appliance %s: %s",
+                    appliance.appliance_id,
+                    result,
                 )
 
-            # Only update appliance usage data every 15 minutes
-            if (appliance_id not in self.appliance_last_consumption_data_update) or (
-                now - self.appliance_last_consumption_data_update[appliance_id]
-                >= timedelta(minutes=14, seconds=45)
-            ):
-                try:
-                    consumption_data = (
-                        await self.api.async_get_consumption_data_for_today(
-                            appliance_id
-                        )
-                    )
-                    _LOGGER.debug(
-                        "Requested consumption data for appliance %s: %s",
-                        appliance_id,
-                        consumption_data,
-                    )
+        with self._phase("index"):
+            self._build_index(data)
+        self._prune_technical_info(data)
+        self._adjust_update_interval(data)
+        self._schedule_transition_refresh(data)
 
-                    if len(consumption_data["data"]) > 0:
-                        self.appliance_consumption_data[appliance_id] = (
-                            consumption_data["data"][0]
-                        )
-                    else:
-                        _LOGGER.warning(
-                            "No consumption data found for appliance %s", appliance_id
-                        )
-                        self.appliance_consumption_data[appliance_id] = {
-                            "heatingEnergyConsumed": 0.0,
-                            "hotWaterEnergyConsumed": 0.0,
-                            "coolingEnergyConsumed": 0.0,
-                            "heatingEnergyDelivered": 0.0,
-                            "hotWaterEnergyDelivered": 0.0,
-                            "coolingEnergyDelivered": 0.0,
-                        }
-
-                    self.appliance_last_consumption_data_update[appliance_id] = now
-                except ClientResponseError as err:
-                    _LOGGER.warning(
-                        "Failed to request consumption data for appliance %s: %s",
-                        appliance_id,
-                        err,
+        # Revalidate technical information loaded from storage without blocking
+        for appliance in data["appliances"]:
+            appliance_id = appliance.appliance_id
+            if appliance_id in self._unvalidated_technical_info:
+                self._unvalidated_technical_info.discard(appliance_id)
+                target = self._async_revalidate_technical_info(appliance_id)
+                name = f"{DOMAIN} revalidate technical information {appliance_id}"
+                # Tie the task to the config entry so it is cancelled on unload
+                if self.config_entry is not None:
+                    self.config_entry.async_create_background_task(
+                        self.hass, target, name
                     )
+                else:
+                    self.hass.async_create_background_task(target, name)
 
-            # Get the cached consumption data for the appliance or use default values
-            if appliance_id in self.appliance_consumption_data:
-                appliance["consumptionData"] = self.appliance_consumption_data[
-                    appliance_id
-                ]
-            else:
-                appliance["consumptionData"] = {
-                    "heatingEnergyConsumed": 0.0,
-                    "hotWaterEnergyConsumed": 0.0,
-                    "coolingEnergyConsumed": 0.0,
-                    "heatingEnergyDelivered": 0.0,
-                    "hotWaterEnergyDelivered": 0.0,
-                    "coolingEnergyDelivered": 0.0,
-                }
-
-            self.device_info[appliance_id] = DeviceInfo(
-                identifiers={(DOMAIN, appliance_id)},
-                name=appliance["houseName"],
-                manufacturer="Remeha",
-                model=self.technical_info[appliance_id]["applianceName"],
+        if previous_update_success and not self.data_is_stale:
+            self.changed_keys = self._changed_keys
+
+        self.data_is_stale = False
+        self.last_successful_update = now
+        self._schedule_data_expiry()
+        self.api.mark_dashboard_applied()
+        self._async_save_snapshot(data, now)
+
+        return data
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return the time since the last successful update."""
+        if self.last_successful_update is None:
+            return None
+        return datetime.now() - self.last_successful_update
+
+    def _build_index(self, data: dict) -> None:
+        """Build the item and device info lookup tables from the dashboard."""
+        for appliance in data["appliances"]:
+            appliance_id = appliance.appliance_id
+
+            self._update_item(appliance_id, appliance, _project_appliance)
+
+            # Fall back to unknown values until the technical information is available
+            technical_info = self.technical_info.get(
+                appliance_id, UNKNOWN_TECHNICAL_INFO
+            )
+
+            self._update_device_info(
+                appliance_id,
+                name=appliance.house_name,
+                model=technical_info["applianceName"],
             )
 
-            for climate_zone in appliance["climateZones"]:
-                climate_zone_id = climate_zone["climateZoneId"]
+            for climate_zone in appliance.climate_zones:
+                climate_zone_id = climate_zone.climate_zone_id
                 # This assumes that all climate zones for an appliance share the same gateway
-                gateways = self.technical_info[appliance_id][
-                    "internetConnectedGateways"
-                ]
+                gateways = technical_info["internetConnectedGateways"]
 
                 if len(gateways) > 1:
                     _LOGGER.warning(
@@ -165,34 +574,646 @@ class RemehaHomeUpdateCoordinator(DataUpdateCoordinator):
                         "softwareVersion": "Unknown",
                     }
 
-                self.items[climate_zone_id] = climate_zone
-                self.device_info[climate_zone_id] = DeviceInfo(
-                    identifiers={(DOMAIN, climate_zone_id)},
-                    name=climate_zone["name"],
-                    manufacturer="Remeha",
+                self._update_item(climate_zone_id, climate_zone, _project_climate_zone)
+                self._update_device_info(
+                    climate_zone_id,
+                    name=climate_zone.name,
                     model=gateway_info["name"],
                     hw_version=gateway_info["hardwareVersion"],
                     sw_version=gateway_info["softwareVersion"],
                     via_device=(DOMAIN, appliance_id),
                 )
 
-            for hot_water_zone in appliance["hotWaterZones"]:
-                hot_water_zone_id = hot_water_zone["hotWaterZoneId"]
-                self.items[hot_water_zone_id] = hot_water_zone
-                self.device_info[hot_water_zone_id] = DeviceInfo(
-                    identifiers={(DOMAIN, hot_water_zone_id)},
-                    name=hot_water_zone["name"],
-                    manufacturer="Remeha",
+            for hot_water_zone in appliance.hot_water_zones:
+                hot_water_zone_id = hot_water_zone.hot_water_zone_id
+                self._update_item(
+                    hot_water_zone_id, hot_water_zone, _project_hot_water_zone
+                )
+                self._update_device_info(
+                    hot_water_zone_id,
+                    name=hot_water_zone.name,
                     model="Hot Water Zone",
                     via_device=(DOMAIN, appliance_id),
                 )
 
-        return data
+    def _update_item(self, item_id: str, item: RemehaHomeModel, project) -> None:
+        """Store an item and record which of its top-level keys have changed.
+
+        Pending values of the item are reconciled with the new data. The
+        projection of the item, which the entities read their state from, is only
+        rebuilt when the item or its pending values have changed.
+        """
+        previous = self.items.get(item_id)
+        if previous is None:
+            self._changed_keys[item_id] = {key for key, _, _ in item.FIELDS}
+        elif previous != item:
+            self._changed_keys[item_id] = item.changed_keys(previous)
+
+        self.items[item_id] = item
+        self._projectors[item_id] = project
+
+        had_pending = item_id in self._pending
+        if had_pending and (rolled_back := self._reconcile_pending(item_id, item)):
+            self._changed_keys.setdefault(item_id, set()).update(rolled_back)
+        if (
+            had_pending
+            or item_id in self._changed_keys
+            or item_id not in self.projections
+        ):
+            self._update_view(item_id)
+
+    def _update_view(self, item_id: str) -> None:
+        """Apply the pending values to an item and rebuild its projection."""
+        item = self.items[item_id]
+        if pending := self._pending.get(item_id):
+            item = item.copy()
+            item.update({key: value for key, (value, _) in pending.items()})
+            self._overlaid_items[item_id] = item
+        else:
+            self._overlaid_items.pop(item_id, None)
+        self.projections[item_id] = self._projectors[item_id](item)
+
+    def _reconcile_pending(self, item_id: str, item: RemehaHomeModel) -> set[str]:
+        """Drop the pending values that are confirmed by the item or have expired.
+
+        Returns the API keys for which expired values were rolled back. Values
+        that are not yet confirmed are kept until their deadline, as the data may
+        have been requested before the command was processed.
+        """
+        pending = self._pending[item_id]
+        now = time.monotonic()
+        rolled_back = set()
+        for key, (value, deadline) in list(pending.items()):
+            if item[key] == value:
+                del pending[key]
+            elif deadline <= now:
+                _LOGGER.debug(
+                    "Rolling back unconfirmed %s of %s to %s", key, item_id, item[key]
+                )
+                del pending[key]
+                rolled_back.add(key)
+        if not pending:
+            del self._pending[item_id]
+        return rolled_back
+
+    @callback
+    def async_set_pending(self, item_id: str, values: dict) -> None:
+        """Show values of an item by API key until a poll confirms them.
+
+        Values that are not confirmed within the pending intent timeout are rolled
+        back to the last polled data. The listeners of the item are updated.
+        """
+        deadline = time.monotonic() + PENDING_INTENT_TIMEOUT.total_seconds()
+        pending = self._pending.setdefault(item_id, {})
+        for key, value in values.items():
+            pending[key] = (value, deadline)
+        self._update_view(item_id)
+        self._schedule_pending_expiry()
+
+        # Confirm the values within the minimum interval, also while idle
+        if self.update_interval is None or (
+            self.update_interval > self.min_update_interval
+        ):
+            self._schedule_one_shot_refresh(dt_util.utcnow() + self.min_update_interval)
+
+        self.changed_keys = {item_id: set(values)}
+        self.async_update_listeners()
+
+    @callback
+    def async_clear_pending(self, item_id: str, values: dict) -> None:
+        """Roll back pending values of an item, for example when a command failed.
+
+        Values that were replaced by a later command are kept.
+        """
+        pending = self._pending.get(item_id, {})
+        cleared = {
+            key
+            for key, value in values.items()
+            if key in pending and pending[key][0] == value
+        }
+        if not cleared:
+            return
+
+        for key in cleared:
+            del pending[key]
+        if not pending:
+            del self._pending[item_id]
+        self._update_view(item_id)
+
+        self.changed_keys = {item_id: cleared}
+        self.async_update_listeners()
+
+    @callback
+    def _schedule_pending_expiry(self) -> None:
+        """Schedule the roll back of the first pending value to expire."""
+        if self._unsub_pending_expiry is not None:
+            self._unsub_pending_expiry()
+            self._unsub_pending_expiry = None
+
+        deadlines = [
+            deadline
+            for pending in self._pending.values()
+            for _, deadline in pending.values()
+        ]
+        if deadlines:
+            self._unsub_pending_expiry = async_call_later(
+                self.hass,
+                max(min(deadlines) - time.monotonic(), 0),
+                HassJob(self._async_expire_pending, cancel_on_shutdown=True),
+            )
+
+    @callback
+    def _async_expire_pending(self, _now: datetime) -> None:
+        """Roll back the pending values that were not confirmed in time."""
+        self._unsub_pending_expiry = None
+        changed_keys = {}
+        for item_id in list(self._pending):
+            if rolled_back := self._reconcile_pending(item_id, self.items[item_id]):
+                changed_keys[item_id] = rolled_back
+                self._update_view(item_id)
+        self._schedule_pending_expiry()
+
+        if changed_keys:
+            self.changed_keys = changed_keys
+            self.async_update_listeners()
+
+    def _schedule_data_expiry(self) -> None:
+        """Schedule updating the listeners once the data exceeds the maximum age.
+
+        When updates keep failing, the entities become unavailable at that time.
+        """
+        if self._unsub_data_expiry is not None:
+            self._unsub_data_expiry()
+
+        self._unsub_data_expiry = async_call_later(
+            self.hass,
+            max((self.max_data_age - self.data_age).total_seconds(), 0),
+            HassJob(self._async_expire_data, cancel_on_shutdown=True),
+        )
+
+    @callback
+    def _async_expire_data(self, _now: datetime) -> None:
+        """Update all listeners when the data is too old while updates fail."""
+        self._unsub_data_expiry = None
+        if not self.last_update_success:
+            self.changed_keys = None
+            self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled roll back of pending values, connection and refresh."""
+        await super().async_shutdown()
+        if self._unsub_data_expiry is not None:
+            self._unsub_data_expiry()
+            self._unsub_data_expiry = None
+        if self._unsub_pending_expiry is not None:
+            self._unsub_pending_expiry()
+            self._unsub_pending_expiry = None
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+        self._cancel_one_shot_refresh()
+
+    def _update_device_info(self, item_id: str, **device_info) -> None:
+        """Store the device info for an item, only rebuilding it when it changed.
+
+        The device info is only read when the entities are added, so later
+        changes are also applied to the device registry.
+        """
+        inputs = tuple(device_info.items())
+        if (previous_inputs := self._device_info_inputs.get(item_id)) != inputs:
+            self._device_info_inputs[item_id] = inputs
+            self.device_info[item_id] = DeviceInfo(
+                identifiers={(DOMAIN, item_id)}, manufacturer="Remeha", **device_info
+            )
+            if previous_inputs is not None:
+                self._update_device_entry(item_id, device_info)
+
+    def _update_device_entry(self, item_id: str, device_info: dict) -> None:
+        """Update the device registry entry of an item with its new device info."""
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, item_id)})
+        if device is None:
+            return
+
+        device_registry.async_update_device(
+            device.id,
+            **{
+                key: device_info.get(key)
+                for key in ("name", "model", "hw_version", "sw_version")
+            },
+        )
+
+    def _prune_technical_info(self, data: dict) -> None:
+        """Remove the technical information of appliances no longer in the dashboard."""
+        appliance_ids = {appliance.appliance_id for appliance in data["appliances"]}
+        removed = self.technical_info.keys() - appliance_ids
+        if not removed:
+            return
+
+        _LOGGER.debug("Removing technical information of appliances %s", removed)
+        for appliance_id in removed:
+            del self.technical_info[appliance_id]
+            self._unvalidated_technical_info.discard(appliance_id)
+        self._async_save_technical_info()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners for which the item data has changed.
+
+        Listeners registered with an item id as context are updated when any key of
+        that item changes, listeners registered with an (item id, key path) tuple
+        are only updated when the top-level key of that key path changes.
+        Listeners without a context are always updated.
+        """
+        with self._phase("dispatch"):
+            if self.changed_keys is None:
+                super().async_update_listeners()
+                return
+
+            for update_callback, context in list(self._listeners.values()):
+                if context is None:
+                    update_callback()
+                elif isinstance(context, tuple):
+                    item_id, key_path = context
+                    if key_path.split(".")[0] in self.changed_keys.get(item_id, ()):
+                        update_callback()
+                elif context in self.changed_keys:
+                    update_callback()
+
+        # Only dispatch the changes once, until the next successful update
+        self.changed_keys = None
+
+    @callback
+    def _schedule_transition_refresh(self, data: dict) -> None:
+        """Schedule a refresh shortly after the first known transition.
+
+        The climate zones report the next switch time of their schedule and the end
+        of a temporary override, the hot water zones report their next switch time
+        and the end of their boost mode. Any previously scheduled refresh is
+        replaced, as a refresh was just made.
+        """
+        self._cancel_one_shot_refresh()
+
+        now = dt_util.utcnow()
+        transitions = []
+        for appliance in data["appliances"]:
+            if not appliance.appliance_online:
+                continue
+            for climate_zone in appliance.climate_zones:
+                transitions.append(_parse_time(climate_zone.next_switch_time))
+                if climate_zone.temporary_override is not None:
+                    transitions.append(
+                        _parse_time(climate_zone.temporary_override["endTime"])
+                    )
+            for hot_water_zone in appliance.hot_water_zones:
+                transitions.append(_parse_time(hot_water_zone.next_switch_time))
+                transitions.append(_parse_time(hot_water_zone.boost_mode_end_time))
+
+        # Transitions that have passed are not yet reflected by the dashboard, and
+        # are picked up by the next poll
+        if upcoming := [
+            transition
+            for transition in transitions
+            if transition is not None and transition > now
+        ]:
+            self._schedule_one_shot_refresh(min(upcoming) + TRANSITION_REFRESH_DELAY)
+
+    @callback
+    def _schedule_one_shot_refresh(self, refresh_time: datetime) -> None:
+        """Schedule a refresh at a time, unless an earlier one is scheduled."""
+        if (
+            self._one_shot_refresh_time is not None
+            and self._one_shot_refresh_time <= refresh_time
+        ):
+            return
+
+        self._cancel_one_shot_refresh()
+        _LOGGER.debug("Scheduling a refresh at %s", refresh_time)
+        self._one_shot_refresh_time = refresh_time
+        self._unsub_one_shot_refresh = async_track_point_in_utc_time(
+            self.hass,
+            HassJob(self._async_one_shot_refresh, cancel_on_shutdown=True),
+            refresh_time,
+        )
+
+    @callback
+    def _cancel_one_shot_refresh(self) -> None:
+        """Cancel the scheduled refresh, if any."""
+        if self._unsub_one_shot_refresh is not None:
+            self._unsub_one_shot_refresh()
+            self._unsub_one_shot_refresh = None
+        self._one_shot_refresh_time = None
+
+    async def _async_one_shot_refresh(self, _now: datetime) -> None:
+        """Refresh at the scheduled time.
+
+        The next poll is scheduled from the end of this refresh.
+        """
+        self._unsub_one_shot_refresh = None
+        self._one_shot_refresh_time = None
+        await self.async_request_refresh()
+
+    def _adjust_update_interval(self, data: dict) -> None:
+        """Adjust the polling interval to the activity in the dashboard.
+
+        While any zone is active or values set by commands await confirmation, the
+        minimum interval is used. When all appliances are offline or all climate
+        zones are in frost protection the maximum interval is used. Otherwise the
+        interval is doubled on each idle poll, up to the maximum interval.
+        """
+        appliances = data["appliances"]
+        climate_zones = [
+            climate_zone
+            for appliance in appliances
+            if appliance.appliance_online
+            for climate_zone in appliance.climate_zones
+        ]
+        hot_water_zones = [
+            hot_water_zone
+            for appliance in appliances
+            if appliance.appliance_online
+            for hot_water_zone in appliance.hot_water_zones
+        ]
+
+        if (
+            self._pending
+            or any(
+                climate_zone.active_comfort_demand in ACTIVE_COMFORT_DEMANDS
+                for climate_zone in climate_zones
+            )
+            or any(
+                hot_water_zone.dhw_status == "ProducingHeat"
+                for hot_water_zone in hot_water_zones
+            )
+        ):
+            update_interval = self.min_update_interval
+        elif all(
+            climate_zone.zone_mode == "FrostProtection"
+            for climate_zone in climate_zones
+        ):
+            # This also covers the case where all appliances are offline
+            update_interval = self.max_update_interval
+        else:
+            update_interval = min(self.update_interval * 2, self.max_update_interval)
+
+        if self._poll_offset:
+            update_interval += self._poll_offset
+            self._poll_offset = timedelta(0)
+
+        if update_interval != self.update_interval:
+            _LOGGER.debug("Changing update interval to %s", update_interval)
+            self.update_interval = update_interval
+
+    async def _async_update_appliance(self, appliance_id: str) -> None:
+        """Request the technical information for an appliance."""
+        # Request appliance technical information the first time it is discovered
+        if appliance_id in self.technical_info:
+            return
+
+        with self.tracer.span("technical_information", appliance_id=appliance_id):
+            try:
+                async with self._request_semaphore:
+                    technical_info = (
+                        await self.api.async_get_appliance_technical_information(
+                            appliance_id
+                        )
+                    )
+                _LOGGER.debug(
+                    "Requested technical information for appliance %s: %s",
+                    appliance_id,
+                    technical_info,
+                )
+                self.technical_info[appliance_id] = technical_info
+                self._async_save_technical_info()
+            except (
+                ClientResponseError,
+                RemehaHomeCircuitOpen,
+                RemehaHomeRateLimited,
+            ) as err:
+                _LOGGER.warning(
+                    "Failed to request technical information for appliance %s: %s",
+                    appliance_id,
+                    err,
+                )
 
     def get_by_id(self, item_id: str):
-        """Return item with the specified item id."""
+        """Return item with the specified item id, including its pending values."""
+        if item_id in self._overlaid_items:
+            return self._overlaid_items[item_id]
         return self.items.get(item_id)
 
+    def get_projection(self, item_id: str):
+        """Return the precomputed values for the item with the specified id."""
+        return self.projections.get(item_id)
+
     def get_device_info(self, item_id: str):
         """Return device info for the item with the specified id."""
         return self.device_info.get(item_id)
+
+    def get_metrics(self) -> dict:
+        """Return the request and refresh metrics shown by the diagnostic sensors."""
+        metrics = self.api.metrics
+        return {
+            "api_requests": metrics.requests,
+            "api_errors": metrics.errors,
+            "api_bytes_received": metrics.bytes_received,
+            "api_latency_mean": metrics.latency.mean_ms,
+            "api_latency_p95": metrics.latency.percentile(95),
+            "refresh_duration": self.refresh_metrics.last_ms.get("total"),
+        }
+
+
+class RemehaHomeConsumptionUpdateCoordinator(DataUpdateCoordinator[dict[str, dict]]):
+    """Remeha Home energy consumption update coordinator.
+
+    The consumption of today is polled separately from the dashboard, shortly
+    after each interval boundary at which the cloud aggregates it. The data maps
+    the appliance ids to their consumption. When the request for an appliance
+    fails, its previous consumption is kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: RemehaHomeAPI,
+        dashboard_coordinator: RemehaHomeUpdateCoordinator,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        interval: timedelta = CONSUMPTION_UPDATE_INTERVAL,
+        delay: timedelta = CONSUMPTION_UPDATE_DELAY,
+        config_entry: ConfigEntry | None = None,
+    ) -> None:
+        """Initialize Remeha Home consumption update coordinator."""
+        self.interval = interval
+        self.delay = delay
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} consumption",
+            update_interval=self._time_until_next_update(),
+            # Only notify the energy sensors when the consumption has changed
+            always_update=False,
+        )
+        self.api = api
+        self.tracer = api.tracer
+        self.dashboard_coordinator = dashboard_coordinator
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    def _time_until_next_update(self) -> timedelta:
+        """Return the time until the next aligned update.
+
+        Updates are aligned to the interval boundaries since local midnight, plus
+        the delay for the cloud to aggregate the consumption.
+        """
+        now = dt_util.now()
+        elapsed = (now - dt_util.start_of_local_day(now) - self.delay).total_seconds()
+        interval = self.interval.total_seconds()
+        return timedelta(seconds=interval - elapsed % interval)
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh the consumption, tracing the refresh."""
+        with self.tracer.trace("consumption_refresh"):
+            await super()._async_refresh(*args, **kwargs)
+
+    async def _async_update_data(self) -> dict[str, dict]:
+        """Fetch the consumption of today for all appliances."""
+        try:
+            if self.dashboard_coordinator.data is None:
+                return {}
+
+            appliance_ids = [
+                appliance.appliance_id
+                for appliance in self.dashboard_coordinator.data["appliances"]
+            ]
+            async with asyncio.timeout(CONSUMPTION_UPDATE_TIMEOUT.total_seconds()):
+                results = await asyncio.gather(
+                    *(
+                        self._async_get_consumption(appliance_id)
+                        for appliance_id in appliance_ids
+                    ),
+                    return_exceptions=True,
+                )
+        finally:
+            self.update_interval = self._time_until_next_update()
+
+        data = {}
+        failures = 0
+        for appliance_id, result in zip(appliance_ids, results):
+            if isinstance(
+                result,
+                ClientError
+                | asyncio.TimeoutError
+                | RemehaHomeCircuitOpen
+                | RemehaHomeRateLimited,
+            ):
+                _LOGGER.warning(
+                    "Failed to request consumption data for appliance %s: %s",
+                    appliance_id,
+                    result,
+                )
+                failures += 1
+                if self.data is not None and appliance_id in self.data:
+                    data[appliance_id] = self.data[appliance_id]
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                data[appliance_id] = result
+
+        if appliance_ids and failures == len(appliance_ids):
+            raise UpdateFailed("Failed to request consumption data for all appliances")
+        return data
+
+    async def _async_get_consumption(self, appliance_id: str) -> dict:
+        """Request the consumption of today for an appliance."""
+        with self.tracer.span("consumption", appliance_id=appliance_id):
+            async with self._request_semaphore:
+                consumption_data = await self.api.async_get_consumption_data_for_today(
+                    appliance_id
+                )
+        _LOGGER.debug(
+            "Requested consumption data for appliance %s: %s",
+            appliance_id,
+            consumption_data,
+        )
+
+        if len(consumption_data["data"]) > 0:
+            return consumption_data["data"][0]
+
+        _LOGGER.warning("No consumption data found for appliance %s", appliance_id)
+        return dict(EMPTY_CONSUMPTION_DATA)
+
+
+class RemehaHomeEnergyAnalyticsUpdateCoordinator(
+    DataUpdateCoordinator[dict[str, dict]]
+):
+    """Remeha Home energy analytics update coordinator.
+
+    The efficiency of the appliances is computed from the daily statistics of the
+    imported consumption history and of the outdoor temperature sensors. It is not
+    polled, but refreshed after each run of the energy backfill. The data maps the
+    appliance ids to their analytics.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dashboard_coordinator: RemehaHomeUpdateCoordinator,
+        config_entry: ConfigEntry | None = None,
+    ) -> None:
+        """Initialize Remeha Home energy analytics update coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} energy analytics",
+            update_interval=None,
+            always_update=False,
+        )
+        self.dashboard_coordinator = dashboard_coordinator
+
+    async def _async_update_data(self) -> dict[str, dict]:
+        """Compute the analytics of the days up to yesterday for all appliances."""
+        if self.dashboard_coordinator.data is None:
+            return {}
+
+        entity_registry = er.async_get(self.hass)
+        outdoor_temperature_ids = {
+            appliance.appliance_id: entity_registry.async_get_entity_id(
+                "sensor",
+                DOMAIN,
+                f"{DOMAIN}_{appliance.appliance_id}_"
+                "outdoorTemperatureInformation.applianceOutdoorTemperature",
+            )
+            for appliance in self.dashboard_coordinator.data["appliances"]
+        }
+        statistic_ids = {
+            statistic_id
+            for appliance_id, entity_id in outdoor_temperature_ids.items()
+            for statistic_id in (
+                entity_id,
+                *appliance_statistic_ids(appliance_id).values(),
+            )
+            if statistic_id is not None
+        }
+        start, end = history_period(dt_util.now(), ANALYTICS_HISTORY_DAYS)
+
+        def compute_analytics() -> dict[str, dict]:
+            """Compute the analytics from the statistics in the recorder."""
+            statistics = statistics_during_period(
+                self.hass, start, end, statistic_ids, "day", None, {"change", "mean"}
+            )
+            return {
+                appliance_id: compute_appliance_analytics(
+                    appliance_id,
+                    statistics,
+                    entity_id,
+                    start,
+                    ANALYTICS_HISTORY_DAYS,
+                )
+                for appliance_id, entity_id in outdoor_temperature_ids.items()
+            }
+
+        # Include the statistics the energy backfill has just queued for import
+        recorder = get_instance(self.hass)
+        await recorder.async_block_till_done()
+        return await recorder.async_add_executor_job(compute_analytics)
@@ -0,0 +1,61 @@
+"""Diagnostics support for the Remeha Home integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .models import dashboard_as_dict
+
+TO_REDACT = {"access_token", "refresh_token", "houseName", "name"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    consumption_coordinator = hass.data[DOMAIN][entry.entry_id][
+        "consumption_coordinator"
+    ]
+    analytics_coordinator = hass.data[DOMAIN][entry.entry_id]["analytics_coordinator"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), {"data", "title", "unique_id"}),
+        "api": {
+            "requests": api.metrics.as_dict(),
+            "json_decode": api.json_decode_stats,
+            "dashboard_unchanged_count": api.dashboard_unchanged_count,
+            "rate_limiter": api.rate_limiter_state,
+            "circuit_breaker": api.circuit_breaker_state,
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "data_age": coordinator.data_age.total_seconds()
+            if coordinator.data_age is not None
+            else None,
+            "data_is_stale": coordinator.data_is_stale,
+            "refresh": coordinator.refresh_metrics.as_dict(),
+        },
+        "consumption_coordinator": {
+            "last_update_success": consumption_coordinator.last_update_success,
+            "update_interval": consumption_coordinator.update_interval.total_seconds()
+            if consumption_coordinator.update_interval
+            else None,
+        },
+        "analytics": analytics_coordinator.data
+        if analytics_coordinator is not None
+        else None,
+        "traces": api.tracer.as_list(),
+        "data": async_redact_data(dashboard_as_dict(coordinator.data), TO_REDACT)
+        if coordinator.data is not None
+        else None,
+    }
@@ -0,0 +1,144 @@
+"""Energy efficiency analytics over the imported consumption history."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ANALYTICS_DAYS_PER_YEAR,
+    ANALYTICS_MIN_COVERAGE,
+    ANALYTICS_ROLLING_DAYS,
+    HEATING_DEGREE_DAY_BASE,
+)
+from .energy_backfill import CONSUMPTION_TYPES, energy_statistic_id
+
+# The analytics are only available when NumPy is installed
+HAS_NUMPY = np is not None
+
+
+def appliance_statistic_ids(appliance_id: str) -> dict[str, str]:
+    """Return the ids of the consumption statistics of an appliance by key."""
+    return {
+        key: energy_statistic_id(appliance_id, description.name)
+        for key, description in CONSUMPTION_TYPES
+    }
+
+
+def daily_values(
+    rows: list[dict], value_type: str, start: datetime, days: int
+) -> np.ndarray:
+    """Return the values of daily statistics rows as an array with a value per day.
+
+    The rows start at local midnight, so rounding the number of days since the
+    start also places the days around a change of daylight saving time. Days
+    without a value are NaN.
+    """
+    values = np.full(days, np.nan)
+    if not rows:
+        return values
+
+    starts = np.fromiter((row["start"] for row in rows), float, len(rows))
+    row_values = np.fromiter(
+        (np.nan if (value := row.get(value_type)) is None else value for row in rows),
+        float,
+        len(rows),
+    )
+    indices = np.rint((starts - start.timestamp()) / 86400).astype(int)
+    in_period = (indices >= 0) & (indices < days)
+    values[indices[in_period]] = row_values[in_period]
+    return values
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> float | None:
+    """Return the ratio of the sums over the days on which both are known."""
+    known = ~np.isnan(numerator) & ~np.isnan(denominator)
+    denominator_sum = denominator[known].sum()
+    if denominator_sum <= 0:
+        return None
+    return round(float(numerator[known].sum() / denominator_sum), 2)
+
+
+def _is_covered(values: np.ndarray) -> bool:
+    """Return whether enough days of a window have a value."""
+    return np.count_nonzero(~np.isnan(values)) >= ANALYTICS_MIN_COVERAGE * len(values)
+
+
+def compute_energy_analytics(
+    consumption: dict[str, np.ndarray], outdoor_temperature: np.ndarray
+) -> dict[str, float | None]:
+    """Compute the efficiency of an appliance from its daily history.
+
+    The consumption maps the consumption keys to the energy per day, and the
+    outdoor temperature is the mean temperature per day. All arrays cover the
+    same days, ending with yesterday, and are NaN on days without data.
+    """
+    consumed = sum(
+        consumption[key] for key, _ in CONSUMPTION_TYPES if key.endswith("Consumed")
+    )
+    delivered = sum(
+        consumption[key] for key, _ in CONSUMPTION_TYPES if key.endswith("Delivered")
+    )
+    heating_consumed = consumption["heatingEnergyConsumed"]
+    heating_degree_days = np.clip(
+        HEATING_DEGREE_DAY_BASE - outdoor_temperature, 0, None
+    )
+
+    window = slice(-ANALYTICS_ROLLING_DAYS, None)
+    previous_window = slice(
+        -ANALYTICS_ROLLING_DAYS - ANALYTICS_DAYS_PER_YEAR, -ANALYTICS_DAYS_PER_YEAR
+    )
+
+    energy_per_degree_day = None
+    if _is_covered(heating_degree_days[window]):
+        energy_per_degree_day = _ratio(
+            heating_consumed[window], heating_degree_days[window]
+        )
+
+    year_over_year = None
+    if (
+        len(consumed) >= ANALYTICS_ROLLING_DAYS + ANALYTICS_DAYS_PER_YEAR
+        and _is_covered(consumed[window])
+        and _is_covered(consumed[previous_window])
+        and (previous := np.nanmean(consumed[previous_window])) > 0
+    ):
+        current = np.nanmean(consumed[window])
+        year_over_year = round(float((current - previous) / previous * 100), 1)
+
+    return {
+        "cop_daily": _ratio(delivered[-1:], consumed[-1:]),
+        "cop_rolling": _ratio(delivered[window], consumed[window]),
+        "heating_energy_per_degree_day": energy_per_degree_day,
+        "consumption_year_over_year": year_over_year,
+    }
+
+
+def compute_appliance_analytics(
+    appliance_id: str,
+    statistics: dict[str, list[dict]],
+    outdoor_temperature_statistic_id: str | None,
+    start: datetime,
+    days: int,
+) -> dict[str, float | None]:
+    """Compute the efficiency of an appliance from its daily statistics."""
+    consumption = {
+        key: daily_values(statistics.get(statistic_id, []), "change", start, days)
+        for key, statistic_id in appliance_statistic_ids(appliance_id).items()
+    }
+    outdoor_temperature = daily_values(
+        statistics.get(outdoor_temperature_statistic_id, []), "mean", start, days
+    )
+    return compute_energy_analytics(consumption, outdoor_temperature)
+
+
+def history_period(now: datetime, days: int) -> tuple[datetime, datetime]:
+    """Return the start and the end of the history of days up to yesterday."""
+    end = dt_util.start_of_local_day(now)
+    start = dt_util.start_of_local_day(end.date() - timedelta(days=days))
+    return start, end
@@ -0,0 +1,231 @@
+"""Import of the Remeha Home consumption history into long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+
+import asyncio
+from aiohttp import ClientError
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
+
+from .api import RemehaHomeAPI, RemehaHomeCircuitOpen, RemehaHomeRateLimited
+from .const import (
+    APPLIANCE_CONSUMPTION_SENSOR_TYPES,
+    DOMAIN,
+    ENERGY_BACKFILL_CHUNK_DAYS,
+    ENERGY_BACKFILL_MAX_CONCURRENT_REQUESTS,
+    ENERGY_BACKFILL_MAX_YEARS,
+    ENERGY_BACKFILL_SETTLE_DAYS,
+    ENERGY_BACKFILL_STORAGE_KEY,
+    ENERGY_BACKFILL_STORAGE_VERSION,
+)
+from .models import Appliance
+
+_LOGGER = logging.getLogger(__name__)
+
+# The consumption data keys with the descriptions of their sensors
+CONSUMPTION_TYPES = [
+    (description.key.removeprefix("consumptionData."), description)
+    for description in APPLIANCE_CONSUMPTION_SENSOR_TYPES
+]
+
+
+def energy_statistic_id(appliance_id: str, name: str) -> str:
+    """Return the id of the external statistic for a consumption type."""
+    return f"{DOMAIN}:{slugify(appliance_id)}_{slugify(name)}"
+
+
+class RemehaHomeEnergyBackfill:
+    """Import the daily consumption history of appliances as external statistics.
+
+    The history is requested in chunks of days with a limited number of concurrent
+    requests. The first run uses the monthly totals to find the first day with any
+    consumption. After each batch of chunks the statistics are added in bulk, and
+    the last imported day and the running sums are stored per appliance, so later
+    runs only request the days since the previous run.
+
+    Only complete days are imported. The consumption of a day is recorded in the
+    hour starting at local midnight. The import stops at the first recent day that
+    is missing from the history, and continues from that day on the next run.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: RemehaHomeAPI,
+        entry_id: str,
+        chunk_days: int = ENERGY_BACKFILL_CHUNK_DAYS,
+        max_concurrent_requests: int = ENERGY_BACKFILL_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Create the energy backfill for the appliances of a config entry."""
+        self.hass = hass
+        self.api = api
+        self._chunk_days = chunk_days
+        self._max_concurrent_requests = max_concurrent_requests
+        self._store = Store(
+            hass,
+            ENERGY_BACKFILL_STORAGE_VERSION,
+            f"{ENERGY_BACKFILL_STORAGE_KEY}.{entry_id}",
+        )
+        self._state: dict[str, dict] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_run(self, appliances: list[Appliance]) -> None:
+        """Import the consumption history that is not yet imported."""
+        if self._lock.locked():
+            _LOGGER.debug("Energy backfill is already running")
+            return
+
+        async with self._lock:
+            if self._state is None:
+                self._state = await self._store.async_load() or {}
+
+            for appliance in appliances:
+                try:
+                    await self._async_backfill_appliance(appliance)
+                except (
+                    ClientError,
+                    asyncio.TimeoutError,
+                    RemehaHomeCircuitOpen,
+                    RemehaHomeRateLimited,
+                ) as err:
+                    # The import continues from the watermark on the next run
+                    _LOGGER.warning(
+                        "Failed to import the consumption history of appliance %s: %s",
+                        appliance.appliance_id,
+                        err,
+                    )
+
+    async def _async_backfill_appliance(self, appliance: Appliance) -> None:
+        """Import the consumption history of an appliance."""
+        appliance_id = appliance.appliance_id
+        last_day = dt_util.now().date() - timedelta(days=1)
+
+        if (state := self._state.get(appliance_id)) is None:
+            first_day = await self._async_find_first_day(appliance_id, last_day)
+            state = {
+                "watermark": ((first_day or last_day) - timedelta(days=1)).isoformat(),
+                "sums": {key: 0.0 for key, _ in CONSUMPTION_TYPES},
+            }
+            self._state[appliance_id] = state
+
+        chunks = []
+        start = date.fromisoformat(state["watermark"]) + timedelta(days=1)
+        while start <= last_day:
+            end = min(start + timedelta(days=self._chunk_days - 1), last_day)
+            chunks.append((start, end))
+            start = end + timedelta(days=1)
+
+        if not chunks:
+            return
+        _LOGGER.debug(
+            "Importing the consumption of appliance %s from %s to %s",
+            appliance_id,
+            chunks[0][0],
+            last_day,
+        )
+
+        for index in range(0, len(chunks), self._max_concurrent_requests):
+            batch = chunks[index : index + self._max_concurrent_requests]
+            results = await asyncio.gather(
+                *(
+                    self._async_get_daily_consumption(appliance_id, start, end)
+                    for start, end in batch
+                )
+            )
+
+            days = {day: data for result in results for day, data in result.items()}
+            statistics: dict[str, list[StatisticData]] = {
+                key: [] for key, _ in CONSUMPTION_TYPES
+            }
+            sums = state["sums"]
+            day = batch[0][0]
+            while day <= batch[-1][1]:
+                if day not in days:
+                    if day > last_day - timedelta(days=ENERGY_BACKFILL_SETTLE_DAYS):
+                        _LOGGER.debug(
+                            "Consumption of appliance %s on %s is not available yet",
+                            appliance_id,
+                            day,
+                        )
+                        break
+                else:
+                    day_start = dt_util.start_of_local_day(day)
+                    for key, _ in CONSUMPTION_TYPES:
+                        sums[key] += days[day].get(key) or 0
+                        statistics[key].append(
+                            StatisticData(
+                                start=day_start, state=sums[key], sum=sums[key]
+                            )
+                        )
+                day += timedelta(days=1)
+
+            for key, description in CONSUMPTION_TYPES:
+                if statistics[key]:
+                    async_add_external_statistics(
+                        self.hass,
+                        StatisticMetaData(
+                            has_mean=False,
+                            has_sum=True,
+                            name=f"{appliance.house_name} {description.name}",
+                            source=DOMAIN,
+                            statistic_id=energy_statistic_id(
+                                appliance_id, description.name
+                            ),
+                            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                        ),
+                        statistics[key],
+                    )
+
+            # Only advance to the last day that was imported without a gap
+            state["watermark"] = (day - timedelta(days=1)).isoformat()
+            await self._store.async_save(self._state)
+            if day <= batch[-1][1]:
+                return
+
+    async def _async_get_daily_consumption(
+        self, appliance_id: str, start: date, end: date
+    ) -> dict[date, dict]:
+        """Return the consumption per day between two days."""
+        response = await self.api.async_get_consumption_data(
+            appliance_id,
+            "daily",
+            datetime.combine(start, time.min),
+            datetime.combine(end, time(23, 59, 59)),
+        )
+        days = {}
+        for data_point in response.get("data") or []:
+            if (timestamp := dt_util.parse_datetime(data_point["timeStamp"])) is None:
+                continue
+            # Ignore data points outside of the requested days
+            if start <= (day := timestamp.date()) <= end:
+                days[day] = data_point
+        return days
+
+    async def _async_find_first_day(
+        self, appliance_id: str, last_day: date
+    ) -> date | None:
+        """Return the first day of the first month with consumption, if any."""
+        first_month = date(last_day.year - ENERGY_BACKFILL_MAX_YEARS, last_day.month, 1)
+        response = await self.api.async_get_consumption_data(
+            appliance_id,
+            "monthly",
+            datetime.combine(first_month, time.min),
+            datetime.combine(last_day, time(23, 59, 59)),
+        )
+        months = [
+            timestamp.date().replace(day=1)
+            for data_point in response.get("data") or []
+            if any(data_point.get(key) for key, _ in CONSUMPTION_TYPES)
+            and (timestamp := dt_util.parse_datetime(data_point["timeStamp"]))
+            is not None
+        ]
+        return max(min(months), first_month) if months else None
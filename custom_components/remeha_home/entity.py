@@ -0,0 +1,84 @@
+"""Base entity for the Remeha Home integration."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable
+from typing import Any
+
+from aiohttp import ClientError, ClientResponseError
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import RemehaHomeCircuitOpen, RemehaHomeRateLimited
+from .coordinator import RemehaHomeUpdateCoordinator
+
+
+def command_error(err: Exception) -> Exception:
+    """Return the error to raise to the caller of a command that failed with err.
+
+    Known API failures are raised as a HomeAssistantError with a readable message.
+    """
+    if isinstance(err, RemehaHomeRateLimited):
+        error = HomeAssistantError(
+            "Too many requests to the Remeha Home API, "
+            f"retry after {err.retry_after:.0f} seconds"
+        )
+    elif isinstance(err, ClientResponseError) and err.status < 500:
+        error = HomeAssistantError(
+            f"Remeha Home API rejected the command ({err.status} {err.message})"
+        )
+    elif isinstance(err, RemehaHomeCircuitOpen | ClientResponseError):
+        error = HomeAssistantError("Remeha Home API is unavailable")
+    elif isinstance(err, ClientError | TimeoutError):
+        error = HomeAssistantError(f"Unable to reach the Remeha Home API: {err!r}")
+    else:
+        return err
+
+    error.__cause__ = err
+    return error
+
+
+class RemehaHomeEntity(CoordinatorEntity[RemehaHomeUpdateCoordinator]):
+    """Base class for all Remeha Home entities."""
+
+    @property
+    def available(self) -> bool:
+        """Return if the entity is available.
+
+        When updates fail the last known data is used, until it gets older than the
+        maximum data age of the coordinator.
+        """
+        if super().available:
+            return True
+
+        data_age = self.coordinator.data_age
+        return data_age is not None and data_age < self.coordinator.max_data_age
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes of the entity."""
+        attributes = {}
+        if self.coordinator.data_is_stale:
+            attributes["stale"] = True
+        if not self.coordinator.last_update_success and (
+            data_age := self.coordinator.data_age
+        ):
+            attributes["data_age"] = int(data_age.total_seconds())
+        return attributes or None
+
+    async def async_send_command(
+        self, item_id: str, values: dict, command: Awaitable
+    ) -> None:
+        """Send a command, showing the values it sets until a poll confirms them.
+
+        The values are rolled back immediately when the command fails.
+        """
+        self.coordinator.async_set_pending(item_id, values)
+        try:
+            await command
+        except Exception as err:
+            self.coordinator.async_clear_pending(item_id, values)
+            if (error := command_error(err)) is not err:
+                raise error from err
+            raise
@@ -0,0 +1,195 @@
+"""Request and refresh metrics for the Remeha Home integration."""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+
+# Upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 15000)
+
+
+class LatencyHistogram:
+    """Histogram of durations with fixed buckets.
+
+    Durations longer than the last bucket are counted in an overflow bucket.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Create an empty histogram with the bucket bounds in milliseconds."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a duration."""
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    @property
+    def mean_ms(self) -> float | None:
+        """Return the mean duration in milliseconds."""
+        if self.count == 0:
+            return None
+        return self.total_ms / self.count
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return an upper bound of a percentile of the durations in milliseconds.
+
+        The bound is the upper bound of the bucket the percentile falls in, or the
+        maximum duration if that is lower.
+        """
+        if self.count == 0:
+            return None
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for bound, count in zip((*self.buckets, self.max_ms), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a dict."""
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max_ms,
+            "buckets": {
+                **{
+                    f"le_{bound}ms": count
+                    for bound, count in zip(self.buckets, self.counts)
+                },
+                "overflow": self.counts[-1],
+            },
+        }
+
+
+class EndpointMetrics:
+    """Metrics of the requests to a single API endpoint."""
+
+    def __init__(self) -> None:
+        """Create empty endpoint metrics."""
+        self.requests = 0
+        self.errors: Counter[str] = Counter()
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> dict:
+        """Return the endpoint metrics as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class RequestMetrics:
+    """Request counts, errors, received bytes and latencies per API endpoint.
+
+    Every HTTP request is counted, including retries. Errors are counted by
+    response status, or by exception name when no response was received.
+    """
+
+    def __init__(self) -> None:
+        """Create empty request metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.latency = LatencyHistogram()
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_request(
+        self,
+        endpoint: str,
+        seconds: float,
+        status: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record a request with its response status or the error it raised."""
+        metrics = self._endpoint(endpoint)
+        metrics.requests += 1
+        metrics.latency.record(seconds)
+        self.latency.record(seconds)
+        if error is not None:
+            metrics.errors[error] += 1
+        elif status is not None and status >= 400:
+            metrics.errors[str(status)] += 1
+
+    def record_bytes(self, endpoint: str, size: int) -> None:
+        """Record the size of a received response body."""
+        self._endpoint(endpoint).bytes_received += size
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests to all endpoints."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests to all endpoints."""
+        return sum(metrics.errors.total() for metrics in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the number of bytes received from all endpoints."""
+        return sum(metrics.bytes_received for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict:
+        """Return the request metrics as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+        }
+
+
+class RefreshMetrics:
+    """Durations of the phases of the coordinator refreshes."""
+
+    def __init__(self) -> None:
+        """Create empty refresh metrics."""
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.last_ms: dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of a phase."""
+        if (histogram := self.phases.get(phase)) is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        histogram.record(seconds)
+        self.last_ms[phase] = seconds * 1000
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Measure the duration of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def as_dict(self) -> dict:
+        """Return the refresh metrics as a dict."""
+        return {
+            phase: {"last_ms": self.last_ms[phase], **histogram.as_dict()}
+            for phase, histogram in self.phases.items()
+        }
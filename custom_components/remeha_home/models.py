@@ -0,0 +1,242 @@
+"""Data models for the Remeha Home dashboard."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RemehaHomeInvalidData(Exception):
+    """Error to indicate that the API returned data in an unexpected format."""
+
+
+def _trimmed(*keys: str) -> Callable[[dict], dict]:
+    """Return a parser that only keeps the specified keys of a nested object."""
+    return lambda value: {key: value.get(key) for key in keys}
+
+
+class RemehaHomeModel:
+    """Base class for the dashboard models.
+
+    Each model only keeps the fields listed in FIELDS, a tuple of the API key, the
+    attribute name and an optional parser for the value. Values can be read by
+    their API key, so entity key paths resolve on models just like on dicts.
+
+    Only the fields in REQUIRED_FIELDS, which identify the model and its nested
+    models, must be present. Other missing fields are None, so a missing value
+    only affects the entities showing it.
+    """
+
+    __slots__ = ()
+
+    FIELDS: tuple[tuple[str, str, Callable[[Any], Any] | None], ...] = ()
+    REQUIRED_FIELDS: frozenset[str] = frozenset()
+    _ATTRIBUTES: dict[str, str] = {}
+
+    def __init_subclass__(cls) -> None:
+        """Build the lookup table from API keys to attributes."""
+        super().__init_subclass__()
+        cls._ATTRIBUTES = {key: attribute for key, attribute, _ in cls.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Parse the model from the API data, dropping all unused fields."""
+        model = cls.__new__(cls)
+        for key, attribute, parse in cls.FIELDS:
+            if key in data:
+                value = data[key]
+                if parse is not None and value is not None:
+                    value = parse(value)
+            elif key in cls.REQUIRED_FIELDS:
+                raise RemehaHomeInvalidData(
+                    f"Missing field {key} in {cls.__name__} data"
+                )
+            else:
+                _LOGGER.debug("Missing field %s in %s data", key, cls.__name__)
+                value = None
+            setattr(model, attribute, value)
+        return model
+
+    def as_dict(self) -> dict:
+        """Return the model as API data."""
+        return {
+            key: _as_api_value(getattr(self, attribute))
+            for key, attribute, _ in self.FIELDS
+        }
+
+    def copy(self):
+        """Return a shallow copy of the model."""
+        model = type(self).__new__(type(self))
+        for _, attribute, _ in self.FIELDS:
+            setattr(model, attribute, getattr(self, attribute))
+        return model
+
+    def update(self, values: dict) -> None:
+        """Update the model with values by their API key."""
+        for key, value in values.items():
+            setattr(self, self._ATTRIBUTES[key], value)
+
+    def changed_keys(self, other: RemehaHomeModel) -> set[str]:
+        """Return the API keys for which the values differ from another model."""
+        return {
+            key
+            for key, attribute, _ in self.FIELDS
+            if getattr(self, attribute) != getattr(other, attribute)
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a value by its API key."""
+        return getattr(self, self._ATTRIBUTES[key])
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether the model has a value for the API key."""
+        return key in self._ATTRIBUTES
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether all values of the models are equal."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, attribute) == getattr(other, attribute)
+            for _, attribute, _ in self.FIELDS
+        )
+
+    def __repr__(self) -> str:
+        """Return a representation of the model."""
+        values = ", ".join(
+            f"{attribute}={getattr(self, attribute)!r}"
+            for _, attribute, _ in self.FIELDS
+        )
+        return f"{type(self).__name__}({values})"
+
+
+def _as_api_value(value: Any) -> Any:
+    """Convert models in a value back to API data."""
+    if isinstance(value, RemehaHomeModel):
+        return value.as_dict()
+    if isinstance(value, list):
+        return [_as_api_value(item) for item in value]
+    return value
+
+
+class ClimateZone(RemehaHomeModel):
+    """Climate zone of an appliance."""
+
+    __slots__ = (
+        "climate_zone_id",
+        "name",
+        "active_comfort_demand",
+        "zone_mode",
+        "fire_place_mode_active",
+        "room_temperature",
+        "set_point",
+        "set_point_min",
+        "set_point_max",
+        "next_setpoint",
+        "next_switch_time",
+        "current_schedule_set_point",
+        "active_heating_climate_time_program_number",
+        "temporary_override",
+    )
+
+    FIELDS = (
+        ("climateZoneId", "climate_zone_id", None),
+        ("name", "name", None),
+        ("activeComfortDemand", "active_comfort_demand", None),
+        ("zoneMode", "zone_mode", None),
+        ("firePlaceModeActive", "fire_place_mode_active", None),
+        ("roomTemperature", "room_temperature", None),
+        ("setPoint", "set_point", None),
+        ("setPointMin", "set_point_min", None),
+        ("setPointMax", "set_point_max", None),
+        ("nextSetpoint", "next_setpoint", None),
+        ("nextSwitchTime", "next_switch_time", None),
+        ("currentScheduleSetPoint", "current_schedule_set_point", None),
+        (
+            "activeHeatingClimateTimeProgramNumber",
+            "active_heating_climate_time_program_number",
+            None,
+        ),
+        ("temporaryOverride", "temporary_override", _trimmed("endTime")),
+    )
+    REQUIRED_FIELDS = frozenset({"climateZoneId"})
+
+
+class HotWaterZone(RemehaHomeModel):
+    """Hot water zone of an appliance."""
+
+    __slots__ = (
+        "hot_water_zone_id",
+        "name",
+        "dhw_status",
+        "dhw_temperature",
+        "next_switch_time",
+        "boost_mode_end_time",
+    )
+
+    FIELDS = (
+        ("hotWaterZoneId", "hot_water_zone_id", None),
+        ("name", "name", None),
+        ("dhwStatus", "dhw_status", None),
+        ("dhwTemperature", "dhw_temperature", None),
+        ("nextSwitchTime", "next_switch_time", None),
+        ("boostModeEndTime", "boost_mode_end_time", None),
+    )
+    REQUIRED_FIELDS = frozenset({"hotWaterZoneId"})
+
+
+class Appliance(RemehaHomeModel):
+    """Appliance with its climate and hot water zones."""
+
+    __slots__ = (
+        "appliance_id",
+        "house_name",
+        "appliance_online",
+        "water_pressure",
+        "outdoor_temperature_information",
+        "climate_zones",
+        "hot_water_zones",
+    )
+
+    FIELDS = (
+        ("applianceId", "appliance_id", None),
+        ("houseName", "house_name", None),
+        ("applianceOnline", "appliance_online", None),
+        ("waterPressure", "water_pressure", None),
+        (
+            "outdoorTemperatureInformation",
+            "outdoor_temperature_information",
+            _trimmed("applianceOutdoorTemperature", "cloudOutdoorTemperature"),
+        ),
+        (
+            "climateZones",
+            "climate_zones",
+            lambda zones: [ClimateZone.from_dict(zone) for zone in zones],
+        ),
+        (
+            "hotWaterZones",
+            "hot_water_zones",
+            lambda zones: [HotWaterZone.from_dict(zone) for zone in zones],
+        ),
+    )
+    REQUIRED_FIELDS = frozenset({"applianceId", "climateZones", "hotWaterZones"})
+
+
+def parse_dashboard(data: dict) -> dict:
+    """Parse the dashboard data into models."""
+    try:
+        return {
+            "appliances": [
+                Appliance.from_dict(appliance) for appliance in data["appliances"]
+            ]
+        }
+    except (KeyError, TypeError, AttributeError) as err:
+        raise RemehaHomeInvalidData(f"Invalid dashboard data: {err!r}") from err
+
+
+def dashboard_as_dict(data: dict) -> dict:
+    """Return the parsed dashboard data as API data."""
+    return {"appliances": [appliance.as_dict() for appliance in data["appliances"]]}
@@ -0,0 +1,221 @@
+"""Profiling of the Remeha Home coordinator refreshes."""
+
+from __future__ import annotations
+
+import cProfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import io
+import logging
+import pstats
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN, PROFILE_TOP_ENTRIES
+
+if TYPE_CHECKING:
+    from .coordinator import RemehaHomeUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Allocations of the profiling itself and of the import system are not reported
+TRACEMALLOC_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class RemehaHomeProfiler:
+    """Profile the next refreshes of a number of coordinators.
+
+    The CPU time is profiled with cProfile while a refresh of any of the
+    coordinators is running, including the updates of the entities the refresh
+    triggers. As the event loop keeps running while a refresh awaits a response,
+    the profile also contains any other work done in the meantime.
+
+    The memory allocations are traced with tracemalloc from the start of the first
+    refresh until the end of the last one. The allocation sites are reported by
+    the size of the memory they allocated in that time that is still allocated.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: Iterable[RemehaHomeUpdateCoordinator],
+        refreshes: int,
+    ) -> None:
+        """Create a profiler for the next refreshes of the coordinators."""
+        self.hass = hass
+        self._remaining = {coordinator: refreshes for coordinator in coordinators}
+        self._profile = cProfile.Profile()
+        self._active_refreshes = 0
+        self._started_tracemalloc = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._allocations: list[tracemalloc.StatisticDiff] = []
+        self._peak_memory = 0
+        self._finished = asyncio.Event()
+        self.refreshes = 0
+
+    def start(self) -> None:
+        """Profile the next refreshes of the coordinators."""
+        if any(coordinator.profiler is not None for coordinator in self._remaining):
+            raise HomeAssistantError("A profile is already being captured")
+
+        # Fail early when another profiler is active, instead of during a refresh
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Unable to start profiling: {err}") from err
+        self._profile.disable()
+
+        for coordinator in self._remaining:
+            coordinator.profiler = self
+
+    def stop(self) -> None:
+        """Stop profiling, also when not all refreshes have finished."""
+        for coordinator in self._remaining:
+            if coordinator.profiler is self:
+                coordinator.profiler = None
+        self._remaining.clear()
+
+        if self._active_refreshes > 0:
+            self._active_refreshes = 0
+            self._profile.disable()
+
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+            self._allocations = snapshot.compare_to(self._snapshot, "lineno")
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            self._snapshot = None
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        self._finished.set()
+
+    async def async_wait(self, timeout: float) -> None:
+        """Wait until all refreshes have been profiled, or until the timeout.
+
+        Profiling is stopped when the wait ends, also when it is cancelled.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                await self._finished.wait()
+        except TimeoutError:
+            _LOGGER.debug("Profiled %s refreshes before the timeout", self.refreshes)
+        finally:
+            self.stop()
+
+    @contextmanager
+    def profile_refresh(
+        self, coordinator: RemehaHomeUpdateCoordinator
+    ) -> Iterator[None]:
+        """Profile a refresh of a coordinator."""
+        if self._snapshot is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                TRACEMALLOC_FILTERS
+            )
+
+        # The refreshes of multiple coordinators can overlap
+        if self._active_refreshes == 0:
+            self._profile.enable()
+        self._active_refreshes += 1
+        try:
+            yield
+        finally:
+            if coordinator in self._remaining:
+                self._active_refreshes -= 1
+                if self._active_refreshes == 0:
+                    self._profile.disable()
+
+                self.refreshes += 1
+                self._remaining[coordinator] -= 1
+                if self._remaining[coordinator] == 0:
+                    del self._remaining[coordinator]
+                    coordinator.profiler = None
+                if not self._remaining:
+                    self.stop()
+
+    def hotspots(self, top: int = PROFILE_TOP_ENTRIES) -> list[dict]:
+        """Return the functions with the most time spent in the function itself."""
+        if self.refreshes == 0:
+            return []
+        stats = pstats.Stats(self._profile)
+        entries = sorted(
+            stats.stats.items(), key=lambda item: item[1][2], reverse=True
+        )[:top]
+        return [
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+            for (filename, line, function), (
+                _primitive_calls,
+                calls,
+                total_time,
+                cumulative_time,
+                _callers,
+            ) in entries
+        ]
+
+    def allocation_sites(self, top: int = PROFILE_TOP_ENTRIES) -> list[dict]:
+        """Return the lines that allocated the most memory that is still allocated."""
+        return [
+            {
+                "site": str(statistic.traceback[0]),
+                "size": statistic.size_diff,
+                "count": statistic.count_diff,
+            }
+            for statistic in self._allocations[:top]
+        ]
+
+    def report(self, top: int = PROFILE_TOP_ENTRIES) -> str:
+        """Return a report of the profile as text."""
+        stream = io.StringIO()
+        stream.write(f"Profiled refreshes: {self.refreshes}\n")
+        stream.write(f"Peak traced memory: {self._peak_memory} bytes\n\n")
+
+        if self.refreshes > 0:
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+        stream.write("Allocation sites of memory that is still allocated:\n")
+        for statistic in self._allocations[:top]:
+            stream.write(f"{statistic}\n")
+        return stream.getvalue()
+
+    async def async_write_results(self) -> tuple[str, str]:
+        """Write the profile and the report to the config directory.
+
+        Returns the paths of the profile, which can be loaded with pstats, and of
+        the report.
+        """
+        timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        profile_path = self.hass.config.path(f"{DOMAIN}_profile_{timestamp}.prof")
+        report_path = self.hass.config.path(f"{DOMAIN}_profile_{timestamp}.txt")
+        report = self.report()
+
+        def write_results() -> None:
+            """Write the results to the files."""
+            self._profile.dump_stats(profile_path)
+            with open(report_path, "w", encoding="utf-8") as report_file:
+                report_file.write(report)
+
+        await self.hass.async_add_executor_job(write_results)
+        return profile_path, report_path
@@ -0,0 +1,68 @@
+"""Rate limiting for the Remeha Home API."""
+
+from __future__ import annotations
+
+import time
+
+import asyncio
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    The bucket holds at most `capacity` tokens and is refilled with `rate` tokens
+    per second. Each request takes a single token, waiting for one to become
+    available if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Create a full token bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        """Add the tokens that accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    async def async_acquire(self) -> None:
+        """Take a token from the bucket, waiting until one is available."""
+        # Waiters are served in order, so a request cannot be starved
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class RateBudget:
+    """Request budget shared by all API clients talking to the same cloud.
+
+    Reads and writes have separate token buckets. When the cloud throttles any
+    client, all clients hold off until the Retry-After time has passed.
+    """
+
+    def __init__(
+        self,
+        read_rate: float,
+        read_capacity: float,
+        write_rate: float,
+        write_capacity: float,
+    ) -> None:
+        """Create a rate budget with full token buckets."""
+        self.read_bucket = TokenBucket(read_rate, read_capacity)
+        self.write_bucket = TokenBucket(write_rate, write_capacity)
+        self.retry_after = 0.0
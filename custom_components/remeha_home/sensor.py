@@ -5,24 +5,31 @@ import logging
 
 
 from homeassistant.components.sensor import (
-    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-import homeassistant.util.dt as dt_util
 
 from .const import (
+    APPLIANCE_ANALYTICS_SENSOR_TYPES,
+    APPLIANCE_CONSUMPTION_SENSOR_TYPES,
     APPLIANCE_SENSOR_TYPES,
     CLIMATE_ZONE_SENSOR_TYPES,
     DOMAIN,
     HOT_WATER_ZONE_SENSOR_TYPES,
+    METRICS_SENSOR_TYPES,
 )
-from .coordinator import RemehaHomeUpdateCoordinator
+from .coordinator import (
+    RemehaHomeConsumptionUpdateCoordinator,
+    RemehaHomeEnergyAnalyticsUpdateCoordinator,
+    RemehaHomeUpdateCoordinator,
+)
+from .entity import RemehaHomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,33 +39,53 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Remeha Home sensor entities from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    consumption_coordinator = hass.data[DOMAIN][entry.entry_id][
+        "consumption_coordinator"
+    ]
+    analytics_coordinator = hass.data[DOMAIN][entry.entry_id]["analytics_coordinator"]
 
     entities = []
     for appliance in coordinator.data["appliances"]:
-        appliance_id = appliance["applianceId"]
+        appliance_id = appliance.appliance_id
         for entity_description in APPLIANCE_SENSOR_TYPES:
             entities.append(
                 RemehaHomeSensor(coordinator, appliance_id, entity_description)
             )
+        for entity_description in APPLIANCE_CONSUMPTION_SENSOR_TYPES:
+            entities.append(
+                RemehaHomeConsumptionSensor(
+                    consumption_coordinator, appliance_id, entity_description
+                )
+            )
+        if analytics_coordinator is not None:
+            for entity_description in APPLIANCE_ANALYTICS_SENSOR_TYPES:
+                entities.append(
+                    RemehaHomeAnalyticsSensor(
+                        analytics_coordinator, appliance_id, entity_description
+                    )
+                )
 
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
             for entity_description in CLIMATE_ZONE_SENSOR_TYPES:
                 entities.append(
                     RemehaHomeSensor(coordinator, climate_zone_id, entity_description)
                 )
 
-        for hot_water_zone in appliance["hotWaterZones"]:
-            hot_water_zone_id = hot_water_zone["hotWaterZoneId"]
+        for hot_water_zone in appliance.hot_water_zones:
+            hot_water_zone_id = hot_water_zone.hot_water_zone_id
             for entity_description in HOT_WATER_ZONE_SENSOR_TYPES:
                 entities.append(
                     RemehaHomeSensor(coordinator, hot_water_zone_id, entity_description)
                 )
 
+    for entity_description in METRICS_SENSOR_TYPES:
+        entities.append(RemehaHomeMetricsSensor(coordinator, entry, entity_description))
+
     async_add_entities(entities)
 
 
-class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
+class RemehaHomeSensor(RemehaHomeEntity, SensorEntity):
     """Representation of a Sensor."""
 
     _attr_has_entity_name = True
@@ -70,38 +97,135 @@ class RemehaHomeSensor(CoordinatorEntity, SensorEntity):
         entity_description: SensorEntityDescription,
     ) -> None:
         """Create a Remeha Home sensor entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (item_id, entity_description.key))
         self.entity_description = entity_description
         self.item_id = item_id
         self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
 
     @property
-    def _data(self):
-        """Return the appliance data for this sensor."""
-        return self.coordinator.get_by_id(self.item_id)
+    def native_value(self):
+        """Return the measurement value for this sensor."""
+        return self.coordinator.get_projection(self.item_id)[
+            self.entity_description.key
+        ]
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for this device."""
+        return self.coordinator.get_device_info(self.item_id)
+
+
+class RemehaHomeConsumptionSensor(
+    CoordinatorEntity[RemehaHomeConsumptionUpdateCoordinator], SensorEntity
+):
+    """Representation of an energy consumption sensor of an appliance."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: RemehaHomeConsumptionUpdateCoordinator,
+        appliance_id: str,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Create a Remeha Home consumption sensor entity."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self.item_id = appliance_id
+        self._consumption_key = entity_description.key.split(".")[-1]
+        self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
+
+    @property
+    def available(self) -> bool:
+        """Return if the consumption of the appliance is known."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.item_id in self.coordinator.data
+        )
 
     @property
     def native_value(self):
-        """Return the measurement value for this sensor."""
-        data = self._data
-        for part in self.entity_description.key.split("."):
-            # If the key is missing for some reason, don't crash, instead return None
-            if part not in data:
-                _LOGGER.warning(
-                    "Key not found in data: %s", self.entity_description.key
-                )
-                return None
-            data = data[part]
-        value = data
+        """Return the consumption of today."""
+        return self.coordinator.data[self.item_id].get(self._consumption_key)
 
-        if self.entity_description.device_class == SensorDeviceClass.TIMESTAMP:
-            return dt_util.parse_datetime(value).replace(
-                tzinfo=dt_util.DEFAULT_TIME_ZONE
-            )
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info for this device."""
+        return self.coordinator.dashboard_coordinator.get_device_info(self.item_id)
 
-        return value
+
+class RemehaHomeAnalyticsSensor(
+    CoordinatorEntity[RemehaHomeEnergyAnalyticsUpdateCoordinator], SensorEntity
+):
+    """Representation of an energy analytics sensor of an appliance."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: RemehaHomeEnergyAnalyticsUpdateCoordinator,
+        appliance_id: str,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Create a Remeha Home energy analytics sensor entity."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self.item_id = appliance_id
+        self._attr_unique_id = "_".join([DOMAIN, self.item_id, entity_description.key])
+
+    @property
+    def available(self) -> bool:
+        """Return if the analytics of the appliance are known."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.item_id in self.coordinator.data
+        )
+
+    @property
+    def native_value(self):
+        """Return the value computed from the history up to yesterday."""
+        return self.coordinator.data[self.item_id][self.entity_description.key]
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return device info for this device."""
-        return self.coordinator.get_device_info(self.item_id)
+        return self.coordinator.dashboard_coordinator.get_device_info(self.item_id)
+
+
+class RemehaHomeMetricsSensor(
+    CoordinatorEntity[RemehaHomeUpdateCoordinator], SensorEntity
+):
+    """Representation of a diagnostic sensor for the request and refresh metrics."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: RemehaHomeUpdateCoordinator,
+        entry: ConfigEntry,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Create a Remeha Home metrics sensor entity."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = "_".join(
+            [DOMAIN, entry.entry_id, entity_description.key]
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=f"Remeha Home {entry.title}",
+            manufacturer="Remeha",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, as the metrics are also relevant while updates fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the value of the metric."""
+        return self.coordinator.get_metrics()[self.entity_description.key]
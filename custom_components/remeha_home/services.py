@@ -0,0 +1,97 @@
+"""Services of the Remeha Home integration."""
+
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+    PROFILE_DEFAULT_REFRESHES,
+    PROFILE_MAX_REFRESHES,
+    SERVICE_PROFILE,
+)
+from .profiler import RemehaHomeProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_REFRESHES = "refreshes"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REFRESHES, default=PROFILE_DEFAULT_REFRESHES): vol.All(
+            cv.positive_int, vol.Range(min=1, max=PROFILE_MAX_REFRESHES)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Start profiling the next refreshes of the coordinators of all accounts.
+
+        The service returns once profiling has started. When all refreshes have
+        been profiled, or the time in which they are expected has passed, the
+        results are written to the config directory and reported in a
+        notification.
+        """
+        coordinators = [data["coordinator"] for data in hass.data[DOMAIN].values()]
+        if not coordinators:
+            raise ServiceValidationError("No Remeha Home account is loaded")
+
+        refreshes = call.data[ATTR_REFRESHES]
+        profiler = RemehaHomeProfiler(hass, coordinators, refreshes)
+        profiler.start()
+
+        timeout = (
+            max(coordinator.max_update_interval for coordinator in coordinators)
+            * refreshes
+            + DEFAULT_MIN_UPDATE_INTERVAL
+        )
+        hass.async_create_background_task(
+            _async_report_profile(hass, profiler, timeout.total_seconds()),
+            f"{DOMAIN} profile",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+
+
+async def _async_report_profile(
+    hass: HomeAssistant, profiler: RemehaHomeProfiler, timeout: float
+) -> None:
+    """Wait for the profiled refreshes and report the results."""
+    await profiler.async_wait(timeout)
+    profile_path, report_path = await profiler.async_write_results()
+    hotspots = ", ".join(hotspot["function"] for hotspot in profiler.hotspots()[:5])
+    allocation_sites = ", ".join(
+        site["site"] for site in profiler.allocation_sites()[:5]
+    )
+
+    _LOGGER.info(
+        "Profiled %s refreshes, the report is written to %s. Hotspots: %s. "
+        "Allocation sites: %s",
+        profiler.refreshes,
+        report_path,
+        hotspots,
+        allocation_sites,
+    )
+    persistent_notification.async_create(
+        hass,
+        f"Profiled {profiler.refreshes} refreshes.\n\n"
+        f"- Profile: `{profile_path}`\n"
+        f"- Report: `{report_path}`\n\n"
+        f"Hotspots: {hotspots or 'none'}",
+        title="Remeha Home profile",
+        notification_id=f"{DOMAIN}_profile",
+    )
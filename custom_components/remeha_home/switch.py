@@ -13,11 +13,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import RemehaHomeAPI
 from .const import DOMAIN
 from .coordinator import RemehaHomeUpdateCoordinator
+from .entity import RemehaHomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,8 +31,8 @@ async def async_setup_entry(
 
     entities = []
     for appliance in coordinator.data["appliances"]:
-        for climate_zone in appliance["climateZones"]:
-            climate_zone_id = climate_zone["climateZoneId"]
+        for climate_zone in appliance.climate_zones:
+            climate_zone_id = climate_zone.climate_zone_id
 
             entities.append(
                 RemehaHomeFireplaceModeSwitch(api, coordinator, climate_zone_id)
@@ -41,7 +41,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class RemehaHomeSwitch(CoordinatorEntity, SwitchEntity):
+class RemehaHomeSwitch(RemehaHomeEntity, SwitchEntity):
     """Representation of a switch."""
 
     _attr_has_entity_name = True
@@ -54,7 +54,7 @@ class RemehaHomeSwitch(CoordinatorEntity, SwitchEntity):
         entity_description: SwitchEntityDescription,
     ) -> None:
         """Create a Remeha Home switch entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (climate_zone_id, entity_description.key))
         self.api = api
         self.climate_zone_id = climate_zone_id
         self.entity_description = entity_description
@@ -110,11 +110,23 @@ class RemehaHomeFireplaceModeSwitch(RemehaHomeSwitch):
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
         _LOGGER.debug("Enable fireplace mode")
-        await self.api.async_set_fireplace_mode(self.climate_zone_id, True)
-        await self.coordinator.async_request_refresh()
+        with self.coordinator.tracer.trace(
+            "set_fireplace_mode", entity_id=self.entity_id, enabled=True
+        ):
+            await self.async_send_command(
+                self.climate_zone_id,
+                {self.entity_description.key: True},
+                self.api.async_set_fireplace_mode(self.climate_zone_id, True),
+            )
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
         _LOGGER.debug("Disable fireplace mode")
-        await self.api.async_set_fireplace_mode(self.climate_zone_id, False)
-        await self.coordinator.async_request_refresh()
+        with self.coordinator.tracer.trace(
+            "set_fireplace_mode", entity_id=self.entity_id, enabled=False
+        ):
+            await self.async_send_command(
+                self.climate_zone_id,
+                {self.entity_description.key: False},
+                self.api.async_set_fireplace_mode(self.climate_zone_id, False),
+            )
@@ -0,0 +1,111 @@
+"""Tracing of the refresh and command paths of the Remeha Home integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+from .const import TRACE_BUFFER_SIZE
+
+# The span that is running in the current task. Tasks created while a span is
+# running inherit it, so the spans of concurrent requests share their parent.
+_current_span: ContextVar[Span | None] = ContextVar(
+    "remeha_home_current_span", default=None
+)
+
+
+class Span:
+    """A timed operation, with the spans of the operations it performed."""
+
+    __slots__ = ("name", "attributes", "start", "duration", "error", "children")
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        """Start a span."""
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.duration: float | None = None
+        self.error: str | None = None
+        self.children: list[Span] = []
+
+    def finish(self) -> None:
+        """Finish the span."""
+        self.duration = time.perf_counter() - self.start
+
+    def as_dict(self, trace_start: float) -> dict:
+        """Return the span as a dict, with its start relative to the trace."""
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - trace_start) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3)
+            if self.duration is not None
+            else None,
+            **({"attributes": self.attributes} if self.attributes else {}),
+            **({"error": self.error} if self.error else {}),
+            **(
+                {"children": [child.as_dict(trace_start) for child in self.children]}
+                if self.children
+                else {}
+            ),
+        }
+
+
+class Tracer:
+    """Record traces of spans in a ring buffer.
+
+    A trace is started by a refresh or a command. Spans outside of a trace are not
+    recorded, so requests made in the background do not displace the traces.
+    """
+
+    def __init__(self, max_traces: int = TRACE_BUFFER_SIZE) -> None:
+        """Create a tracer keeping the last traces."""
+        self.traces: deque[tuple[str, Span]] = deque(maxlen=max_traces)
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Start a trace with a root span."""
+        span = Span(name, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = type(err).__name__
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+            self.traces.append((dt_util.utcnow().isoformat(), span))
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Start a span within the running trace, if any."""
+        parent = _current_span.get()
+        # Tasks started by a finished span can outlive it
+        if parent is None or parent.duration is not None:
+            yield None
+            return
+
+        span = Span(name, attributes)
+        parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = type(err).__name__
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+
+    def as_list(self) -> list[dict]:
+        """Return the recorded traces, from old to new."""
+        return [
+            {"finished": finished, **span.as_dict(span.start)}
+            for finished, span in self.traces
+        ]
@@ -0,0 +1 @@
+"""Tests for the Remeha Home integration."""
@@ -0,0 +1,41 @@
+"""Fixtures for the Remeha Home tests."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.remeha_home.tracing import Tracer
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the custom integrations in all tests."""
+    return
+
+
+@pytest.fixture
+def dashboard() -> dict:
+    """Return a dashboard response with one appliance, climate and hot water zone."""
+    return json.loads(load_fixture("dashboard.json"))
+
+
+@pytest.fixture
+def mock_api(dashboard: dict) -> MagicMock:
+    """Return an API client returning the dashboard fixture."""
+    api = MagicMock()
+    api.tracer = Tracer()
+    api.async_get_dashboard = AsyncMock(return_value=dashboard)
+    api.async_prewarm_connection = AsyncMock()
+    api.async_get_appliance_technical_information = AsyncMock(
+        return_value={
+            "applianceName": "Tzerra Ace",
+            "internetConnectedGateways": [
+                {"name": "eTwist", "hardwareVersion": "1", "softwareVersion": "2"}
+            ],
+        }
+    )
+    return api
@@ -0,0 +1,165 @@
+"""Tests for the Remeha Home API client."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import email.utils
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.remeha_home.api import (
+    RemehaHomeAPI,
+    RemehaHomeCircuitOpen,
+    _parse_retry_after,
+)
+from custom_components.remeha_home.const import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    DOMAIN,
+)
+from custom_components.remeha_home.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when advanced."""
+
+    def __init__(self) -> None:
+        """Create a clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a fake monotonic clock for the circuit breaker and rate limiter."""
+    clock = FakeClock()
+    with (
+        patch("custom_components.remeha_home.circuit_breaker.time.monotonic", clock),
+        patch("custom_components.remeha_home.rate_limit.time.monotonic", clock),
+    ):
+        yield clock
+
+
+def _oauth_session(hass: HomeAssistant, valid_token: bool = True) -> MagicMock:
+    """Return an OAuth2 session with a token that expires in an hour."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"token": {}})
+    entry.add_to_hass(hass)
+    session = MagicMock(hass=hass, config_entry=entry, valid_token=valid_token)
+    session.token = {"access_token": "token", "expires_at": time.time() + 3600}
+    return session
+
+
+def _response(status: int) -> MagicMock:
+    """Return a response with a status code."""
+    return MagicMock(status=status, headers={})
+
+
+async def test_circuit_breaker(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test the circuit opens after failures, probes when half open and closes."""
+    session = MagicMock()
+    session.request = AsyncMock(return_value=_response(503))
+    api = RemehaHomeAPI(_oauth_session(hass), session=session)
+
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        await api._async_send_request("GET", "url", "dashboard")
+    assert api.circuit_breaker_state["state"] == "open"
+
+    # Requests fail immediately while the circuit is open
+    with pytest.raises(RemehaHomeCircuitOpen):
+        await api._async_send_request("GET", "url", "dashboard")
+    assert session.request.call_count == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+
+    # A single failed probe is allowed when half open, which opens the circuit again
+    clock.now += CIRCUIT_BREAKER_RESET_TIMEOUT.total_seconds()
+    assert api.circuit_breaker_state["state"] == "half_open"
+    await api._async_send_request("GET", "url", "dashboard")
+    assert api.circuit_breaker_state["state"] == "open"
+    with pytest.raises(RemehaHomeCircuitOpen):
+        await api._async_send_request("GET", "url", "dashboard")
+
+    # A successful probe closes the circuit
+    clock.now += CIRCUIT_BREAKER_RESET_TIMEOUT.total_seconds()
+    session.request.return_value = _response(200)
+    await api._async_send_request("GET", "url", "dashboard")
+    assert api.circuit_breaker_state == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "open_count": 1,
+    }
+    assert session.request.call_count == CIRCUIT_BREAKER_FAILURE_THRESHOLD + 2
+
+
+async def test_token_bucket(clock: FakeClock) -> None:
+    """Test an empty bucket blocks until a token is refilled."""
+    bucket = TokenBucket(rate=100, capacity=2)
+    await bucket.async_acquire()
+    await bucket.async_acquire()
+    assert bucket.tokens == 0
+
+    task = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    clock.now += 0.01
+    await task
+    assert bucket.tokens == pytest.approx(0)
+
+    # The bucket refills up to its capacity
+    clock.now += 1
+    assert bucket.tokens == 2
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("120", 120),
+        ("1.5", 1.5),
+        ("-5", 0),
+        ("soon", None),
+        (email.utils.format_datetime(dt_util.utcnow() - timedelta(hours=1)), 0),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    """Test parsing a Retry-After header in seconds."""
+    assert _parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date() -> None:
+    """Test parsing a Retry-After header with an HTTP date."""
+    retry_at = dt_util.utcnow() + timedelta(minutes=2)
+    value = email.utils.format_datetime(retry_at, usegmt=True)
+    assert _parse_retry_after(value) == pytest.approx(120, abs=2)
+
+
+async def test_concurrent_token_refresh(hass: HomeAssistant) -> None:
+    """Test concurrent requests with an expired token share a single refresh."""
+    oauth_session = _oauth_session(hass, valid_token=False)
+    refreshed = asyncio.Event()
+
+    async def async_refresh_token(token: dict) -> dict:
+        await refreshed.wait()
+        return {"access_token": "new token", "expires_at": time.time() + 3600}
+
+    oauth_session.implementation.async_refresh_token = AsyncMock(
+        side_effect=async_refresh_token
+    )
+    api = RemehaHomeAPI(oauth_session, session=MagicMock())
+
+    tasks = [asyncio.create_task(api.async_get_access_token()) for _ in range(5)]
+    await asyncio.sleep(0)
+    refreshed.set()
+    await asyncio.gather(*tasks)
+
+    assert oauth_session.implementation.async_refresh_token.call_count == 1
+    assert oauth_session.config_entry.data["token"]["access_token"] == "new token"
+    api.async_shutdown()
@@ -0,0 +1,178 @@
+"""Tests for the Remeha Home climate entities."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock, call
+
+from aiohttp import ClientError, ClientResponseError
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.remeha_home import climate
+from custom_components.remeha_home.api import (
+    RemehaHomeCircuitOpen,
+    RemehaHomeRateLimited,
+)
+from custom_components.remeha_home.climate import RemehaHomeClimateEntity
+from custom_components.remeha_home.coordinator import RemehaHomeUpdateCoordinator
+
+
+@pytest.fixture
+async def climate_entity(
+    hass: HomeAssistant,
+    dashboard: dict,
+    mock_api: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[RemehaHomeClimateEntity]:
+    """Return the climate entity of the climate zone in the dashboard fixture."""
+    monkeypatch.setattr(climate, "SETPOINT_DEBOUNCE_COOLDOWN", 0.01)
+    mock_api.async_set_temporary_override = AsyncMock()
+
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    climate_zone_id = dashboard["appliances"][0]["climateZones"][0]["climateZoneId"]
+    entity = RemehaHomeClimateEntity(mock_api, coordinator, climate_zone_id)
+    entity.hass = hass
+    entity.entity_id = "climate.remeha_home"
+    yield entity
+    await coordinator.async_shutdown()
+
+
+async def test_set_temperature_sends_last_setpoint(
+    climate_entity: RemehaHomeClimateEntity, mock_api: MagicMock
+) -> None:
+    """Test rapid setpoint changes are sent as one request with the last value."""
+    await asyncio.gather(
+        climate_entity.async_set_temperature(temperature=20.0),
+        climate_entity.async_set_temperature(temperature=20.5),
+        climate_entity.async_set_temperature(temperature=21.0),
+    )
+
+    mock_api.async_set_temporary_override.assert_awaited_once_with(
+        climate_entity.climate_zone_id, 21.0
+    )
+    assert climate_entity.target_temperature == 21.0
+
+
+async def test_set_temperature_during_request(
+    climate_entity: RemehaHomeClimateEntity, mock_api: MagicMock
+) -> None:
+    """Test a setpoint requested while a request is in progress is sent after it."""
+    release = asyncio.Event()
+
+    async def set_temporary_override(climate_zone_id: str, setpoint: float) -> None:
+        await release.wait()
+
+    mock_api.async_set_temporary_override.side_effect = set_temporary_override
+    first = asyncio.create_task(climate_entity.async_set_temperature(temperature=20.0))
+    while not mock_api.async_set_temporary_override.await_count:
+        await asyncio.sleep(0.01)
+    second = asyncio.create_task(climate_entity.async_set_temperature(temperature=21.0))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert mock_api.async_set_temporary_override.await_args_list == [
+        call(climate_entity.climate_zone_id, 20.0),
+        call(climate_entity.climate_zone_id, 21.0),
+    ]
+
+
+async def test_set_temperature_failure(
+    climate_entity: RemehaHomeClimateEntity, mock_api: MagicMock
+) -> None:
+    """Test a failure to send the setpoint is raised and rolls the setpoint back."""
+    mock_api.async_set_temporary_override.side_effect = ClientError()
+
+    with pytest.raises(HomeAssistantError, match="Unable to reach"):
+        await climate_entity.async_set_temperature(temperature=21.0)
+
+    assert climate_entity.target_temperature == 16.0
+
+
+async def test_set_temperature_rate_limited(
+    climate_entity: RemehaHomeClimateEntity, mock_api: MagicMock
+) -> None:
+    """Test a throttled setpoint is raised as a readable error."""
+    mock_api.async_set_temporary_override.side_effect = RemehaHomeRateLimited(30)
+
+    with pytest.raises(HomeAssistantError, match="retry after 30 seconds"):
+        await climate_entity.async_set_temperature(temperature=21.0)
+
+    assert climate_entity.target_temperature == 16.0
+
+
+async def test_set_hvac_mode_rate_limited(
+    climate_entity: RemehaHomeClimateEntity, mock_api: MagicMock
+) -> None:
+    """Test a throttled command is raised as a readable error and rolled back."""
+    mock_api.async_set_manual = AsyncMock(side_effect=RemehaHomeRateLimited(30))
+
+    with pytest.raises(HomeAssistantError, match="retry after 30 seconds"):
+        await climate_entity.async_set_hvac_mode(HVACMode.HEAT)
+
+    assert climate_entity.hvac_mode == HVACMode.AUTO
+
+
+@pytest.mark.parametrize(
+    ("error", "message"),
+    [
+        (RemehaHomeCircuitOpen(), "Remeha Home API is unavailable"),
+        (
+            ClientResponseError(MagicMock(), (), status=503),
+            "Remeha Home API is unavailable",
+        ),
+        (
+            ClientResponseError(MagicMock(), (), status=400, message="Bad Request"),
+            r"Remeha Home API rejected the command \(400 Bad Request\)",
+        ),
+        (ClientError(), "Unable to reach the Remeha Home API"),
+        (TimeoutError(), "Unable to reach the Remeha Home API"),
+    ],
+)
+async def test_set_hvac_mode_api_error(
+    climate_entity: RemehaHomeClimateEntity,
+    mock_api: MagicMock,
+    error: Exception,
+    message: str,
+) -> None:
+    """Test a command failing at the API is raised as a readable error."""
+    mock_api.async_set_manual = AsyncMock(side_effect=error)
+
+    with pytest.raises(HomeAssistantError, match=message):
+        await climate_entity.async_set_hvac_mode(HVACMode.HEAT)
+
+    assert climate_entity.hvac_mode == HVACMode.AUTO
+
+
+@pytest.mark.parametrize(
+    ("zone_mode", "pending_zone_mode", "set_schedule"),
+    [
+        ("Manual", "Scheduling", True),
+        ("TemporaryOverride", "TemporaryOverride", False),
+    ],
+)
+async def test_set_preset_mode(
+    climate_entity: RemehaHomeClimateEntity,
+    dashboard: dict,
+    mock_api: MagicMock,
+    zone_mode: str,
+    pending_zone_mode: str,
+    set_schedule: bool,
+) -> None:
+    """Test the zone mode is only shown as scheduling when the preset sets it."""
+    dashboard["appliances"][0]["climateZones"][0]["zoneMode"] = zone_mode
+    await climate_entity.coordinator.async_refresh()
+    mock_api.async_activate_heating_time_program = AsyncMock()
+    mock_api.async_set_schedule = AsyncMock()
+
+    await climate_entity.async_set_preset_mode("clock_program_2")
+
+    climate_zone = climate_entity.coordinator.get_by_id(climate_entity.climate_zone_id)
+    assert climate_zone.zone_mode == pending_zone_mode
+    assert climate_zone.active_heating_climate_time_program_number == 2
+    assert mock_api.async_set_schedule.await_count == set_schedule
@@ -0,0 +1,303 @@
+"""Tests for the Remeha Home update coordinator."""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timedelta
+import json
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.remeha_home.api import RemehaHomeAPI, RemehaHomeCircuitOpen
+from custom_components.remeha_home.binary_sensor import RemehaHomeBinarySensor
+from custom_components.remeha_home.climate import RemehaHomeClimateEntity
+from custom_components.remeha_home.const import (
+    APPLIANCE_SENSOR_TYPES,
+    CLIMATE_ZONE_BINARY_SENSOR_TYPES,
+    CLIMATE_ZONE_SENSOR_TYPES,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    TRANSITION_REFRESH_DELAY,
+)
+from custom_components.remeha_home.coordinator import (
+    RemehaHomeConsumptionUpdateCoordinator,
+    RemehaHomeUpdateCoordinator,
+)
+from custom_components.remeha_home.sensor import RemehaHomeSensor
+
+
+def _store_snapshot(
+    hass_storage: dict[str, Any], dashboard: dict, updated: datetime
+) -> None:
+    """Store a snapshot of the dashboard, saved after an update at a time."""
+    hass_storage[SNAPSHOT_STORAGE_KEY] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": SNAPSHOT_STORAGE_KEY,
+        "data": {"updated": updated.timestamp(), "dashboard": dashboard},
+    }
+
+
+async def test_restored_snapshot_served_while_first_refresh_fails(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    dashboard: dict,
+    mock_api: MagicMock,
+) -> None:
+    """Test the entities stay available with stale data from a recent snapshot."""
+    _store_snapshot(hass_storage, dashboard, datetime.now() - timedelta(minutes=5))
+    mock_api.async_get_dashboard.side_effect = RemehaHomeCircuitOpen()
+
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    assert await coordinator.async_load_snapshot()
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    appliance_id = dashboard["appliances"][0]["applianceId"]
+    sensor = RemehaHomeSensor(coordinator, appliance_id, APPLIANCE_SENSOR_TYPES[0])
+    assert sensor.available
+    assert sensor.native_value == 1.4
+    assert sensor.extra_state_attributes["stale"] is True
+    assert 300 <= sensor.extra_state_attributes["data_age"] < 360
+
+
+async def test_restored_snapshot_older_than_max_data_age(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    dashboard: dict,
+    mock_api: MagicMock,
+) -> None:
+    """Test the entities are unavailable when the snapshot is too old to serve."""
+    _store_snapshot(hass_storage, dashboard, datetime.now() - timedelta(hours=2))
+    mock_api.async_get_dashboard.side_effect = RemehaHomeCircuitOpen()
+
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    assert await coordinator.async_load_snapshot()
+    await coordinator.async_refresh()
+
+    appliance_id = dashboard["appliances"][0]["applianceId"]
+    sensor = RemehaHomeSensor(coordinator, appliance_id, APPLIANCE_SENSOR_TYPES[0])
+    assert not sensor.available
+
+
+async def test_refresh_with_missing_sensor_field(
+    hass: HomeAssistant, dashboard: dict, mock_api: MagicMock
+) -> None:
+    """Test a missing sensor field does not fail the refresh."""
+    del dashboard["appliances"][0]["waterPressure"]
+    del dashboard["appliances"][0]["outdoorTemperatureInformation"]
+
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    appliance_id = dashboard["appliances"][0]["applianceId"]
+    for entity_description in APPLIANCE_SENSOR_TYPES:
+        sensor = RemehaHomeSensor(coordinator, appliance_id, entity_description)
+        assert sensor.available
+        assert sensor.native_value is None
+    await coordinator.async_shutdown()
+
+
+async def test_consecutive_failures_update_listeners(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    dashboard: dict,
+    mock_api: MagicMock,
+) -> None:
+    """Test the entities follow the data age while updates keep failing."""
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    appliance_id = dashboard["appliances"][0]["applianceId"]
+    sensor = RemehaHomeSensor(coordinator, appliance_id, APPLIANCE_SENSOR_TYPES[0])
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    mock_api.async_get_dashboard.side_effect = RemehaHomeCircuitOpen()
+    for failure in range(1, 4):
+        freezer.tick(timedelta(minutes=10))
+        await coordinator.async_refresh()
+
+        assert listener.call_count == failure
+        assert sensor.available
+        assert sensor.extra_state_attributes["data_age"] == failure * 600
+
+    freezer.tick(coordinator.max_data_age - timedelta(minutes=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert listener.call_count > 3
+    assert not sensor.available
+    await coordinator.async_shutdown()
+
+
+async def test_unchanged_dashboard_skipped(
+    hass: HomeAssistant, dashboard: dict, mock_api: MagicMock
+) -> None:
+    """Test an identical dashboard is not applied and a changed one is."""
+    changed = copy.deepcopy(dashboard)
+    changed["appliances"][0]["climateZones"][0]["roomTemperature"] = 21.5
+    response = MagicMock(status=200)
+    response.read = AsyncMock(
+        side_effect=[
+            json.dumps(body).encode() for body in (dashboard, dashboard, changed)
+        ]
+    )
+    session = MagicMock()
+    session.request = AsyncMock(return_value=response)
+    oauth_session = MagicMock(hass=hass, valid_token=True)
+    oauth_session.token = {"access_token": "token", "expires_at": time.time() + 3600}
+    api = RemehaHomeAPI(oauth_session, session=session)
+    api.async_get_appliance_technical_information = (
+        mock_api.async_get_appliance_technical_information
+    )
+
+    coordinator = RemehaHomeUpdateCoordinator(hass, api)
+    climate_zone_id = dashboard["appliances"][0]["climateZones"][0]["climateZoneId"]
+    listener = MagicMock()
+    coordinator.async_add_listener(listener, climate_zone_id)
+
+    with patch.object(
+        api, "_async_decode_json", wraps=api._async_decode_json
+    ) as decode:
+        await coordinator.async_refresh()
+        assert listener.call_count == 1
+
+        # The identical dashboard is neither decoded nor dispatched
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert api.dashboard_unchanged_count == 1
+        assert decode.call_count == 1
+        assert listener.call_count == 1
+
+        await coordinator.async_refresh()
+        assert api.dashboard_unchanged_count == 1
+        assert decode.call_count == 2
+        assert listener.call_count == 2
+        assert coordinator.items[climate_zone_id].room_temperature == 21.5
+
+    await coordinator.async_shutdown()
+
+
+async def test_changed_key_updates_its_entities(
+    hass: HomeAssistant, dashboard: dict, mock_api: MagicMock
+) -> None:
+    """Test only the entities of a changed key of a zone write their state."""
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    appliance_id = dashboard["appliances"][0]["applianceId"]
+    climate_zone_id = dashboard["appliances"][0]["climateZones"][0]["climateZoneId"]
+    entities = {
+        "climate": RemehaHomeClimateEntity(mock_api, coordinator, climate_zone_id),
+        "waterPressure": RemehaHomeSensor(
+            coordinator, appliance_id, APPLIANCE_SENSOR_TYPES[0]
+        ),
+        **{
+            description.key: RemehaHomeSensor(coordinator, climate_zone_id, description)
+            for description in CLIMATE_ZONE_SENSOR_TYPES
+        },
+        "activeComfortDemand": RemehaHomeBinarySensor(
+            coordinator,
+            climate_zone_id,
+            *CLIMATE_ZONE_BINARY_SENSOR_TYPES[0],
+        ),
+    }
+    for entity in entities.values():
+        entity.hass = hass
+        entity.async_write_ha_state = MagicMock()
+        await entity.async_added_to_hass()
+
+    changed = copy.deepcopy(dashboard)
+    changed["appliances"][0]["climateZones"][0]["nextSetpoint"] = 21.5
+    mock_api.async_get_dashboard.return_value = changed
+    await coordinator.async_refresh()
+
+    assert {
+        name for name, entity in entities.items() if entity.async_write_ha_state.called
+    } == {"climate", "nextSetpoint"}
+    await coordinator.async_shutdown()
+
+
+def _local_time(*args: int) -> datetime:
+    """Return a time in the local time zone."""
+    return datetime(*args, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+async def test_transition_refresh(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_api: MagicMock,
+) -> None:
+    """Test a refresh is made once after the next switch time of a zone."""
+    # The climate zone switches at 17:30, the hot water zone at 22:00
+    freezer.move_to(_local_time(2025, 2, 13, 12))
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    coordinator.async_request_refresh = AsyncMock()
+
+    freezer.move_to(
+        _local_time(2025, 2, 13, 17, 30)
+        + TRANSITION_REFRESH_DELAY
+        - timedelta(seconds=1)
+    )
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    coordinator.async_request_refresh.assert_not_called()
+
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    coordinator.async_request_refresh.assert_called_once()
+
+    # The refresh for the next transition is cancelled on unload
+    await coordinator.async_refresh()
+    await coordinator.async_shutdown()
+    freezer.move_to(_local_time(2025, 2, 13, 22, 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    coordinator.async_request_refresh.assert_called_once()
+
+
+async def test_consumption_updates_aligned_to_clock(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_api: MagicMock,
+) -> None:
+    """Test the consumption is polled shortly after each quarter of an hour."""
+    freezer.move_to(_local_time(2025, 2, 13, 10, 7, 30))
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    mock_api.async_get_consumption_data_for_today = AsyncMock(
+        return_value={"data": [{"heatingEnergyConsumed": 1.0}]}
+    )
+
+    consumption_coordinator = RemehaHomeConsumptionUpdateCoordinator(
+        hass, mock_api, coordinator
+    )
+    assert consumption_coordinator.update_interval == timedelta(minutes=8, seconds=30)
+    listener = MagicMock()
+    consumption_coordinator.async_add_listener(listener)
+
+    # The first update at 10:16 after the aggregation delay
+    freezer.move_to(_local_time(2025, 2, 13, 10, 16, 2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_api.async_get_consumption_data_for_today.call_count == 1
+    assert listener.call_count == 1
+    assert consumption_coordinator.update_interval == timedelta(minutes=14, seconds=58)
+
+    # An unchanged consumption does not update the listeners
+    freezer.move_to(_local_time(2025, 2, 13, 10, 31, 2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_api.async_get_consumption_data_for_today.call_count == 2
+    assert listener.call_count == 1
+
+    await consumption_coordinator.async_shutdown()
+    await coordinator.async_shutdown()
@@ -0,0 +1,83 @@
+"""Tests for the Remeha Home energy backfill."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.remeha_home.const import (
+    ENERGY_BACKFILL_STORAGE_KEY,
+    ENERGY_BACKFILL_STORAGE_VERSION,
+)
+from custom_components.remeha_home.energy_backfill import (
+    CONSUMPTION_TYPES,
+    RemehaHomeEnergyBackfill,
+)
+
+
+def _daily_consumption(days: list[date]) -> dict:
+    """Return a consumption response with one kWh of heating on each day."""
+    return {
+        "data": [
+            {"timeStamp": f"{day.isoformat()}T00:00:00", "heatingEnergyConsumed": 1.0}
+            for day in days
+        ]
+    }
+
+
+async def test_watermark_waits_for_missing_recent_days(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    mock_api: MagicMock,
+) -> None:
+    """Test the import stops at a recent missing day and continues from it."""
+    freezer.move_to(dt_util.as_utc(dt_util.start_of_local_day(date(2026, 10, 18))))
+    key = f"{ENERGY_BACKFILL_STORAGE_KEY}.entry"
+    hass_storage[key] = {
+        "version": ENERGY_BACKFILL_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": key,
+        "data": {
+            "<appliance uuid>": {
+                "watermark": "2026-10-07",
+                "sums": {key: 0.0 for key, _ in CONSUMPTION_TYPES},
+            }
+        },
+    }
+    appliance = MagicMock(appliance_id="<appliance uuid>", house_name="Home")
+    backfill = RemehaHomeEnergyBackfill(hass, mock_api, "entry")
+
+    # The 10th is missing for good, the 16th and 17th are not published yet
+    mock_api.async_get_consumption_data = AsyncMock()
+    mock_api.async_get_consumption_data.return_value = _daily_consumption(
+        [date(2026, 10, 8), date(2026, 10, 9)]
+        + [date(2026, 10, day) for day in range(11, 16)]
+    )
+    with patch(
+        "custom_components.remeha_home.energy_backfill.async_add_external_statistics"
+    ) as add_statistics:
+        await backfill.async_run([appliance])
+
+        state = hass_storage[key]["data"]["<appliance uuid>"]
+        assert state["watermark"] == "2026-10-15"
+        assert state["sums"]["heatingEnergyConsumed"] == 7.0
+        assert add_statistics.call_count == len(CONSUMPTION_TYPES)
+
+        mock_api.async_get_consumption_data.return_value = _daily_consumption(
+            [date(2026, 10, 16), date(2026, 10, 17)]
+        )
+        await backfill.async_run([appliance])
+
+    # Only the missing days are requested again
+    assert mock_api.async_get_consumption_data.call_args.args[2].date() == date(
+        2026, 10, 16
+    )
+    state = hass_storage[key]["data"]["<appliance uuid>"]
+    assert state["watermark"] == "2026-10-17"
+    assert state["sums"]["heatingEnergyConsumed"] == 9.0
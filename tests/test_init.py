@@ -0,0 +1,60 @@
+"""Tests for the Remeha Home integration setup."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.remeha_home import async_migrate_entry, async_setup
+from custom_components.remeha_home.const import DOMAIN
+
+
+@pytest.mark.parametrize(
+    ("unique_id", "title"),
+    [
+        # Created before multiple accounts were supported
+        (DOMAIN, "User@Example.com"),
+        # Created with the email as unique ID, but renamed since
+        ("user@example.com", "Home"),
+    ],
+)
+async def test_migrate_entry(hass: HomeAssistant, unique_id: str, title: str) -> None:
+    """Test the account email is stored and used as unique ID."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=title,
+        unique_id=unique_id,
+        data={"auth_implementation": DOMAIN, "token": {}},
+        version=1,
+        minor_version=1,
+    )
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry)
+
+    assert entry.unique_id == "user@example.com"
+    assert entry.data[CONF_EMAIL].lower() == "user@example.com"
+    assert entry.minor_version == 2
+    assert entry.title == title
+
+    # The migration only runs once, later renames do not change the unique ID
+    hass.config_entries.async_update_entry(entry, title="Renamed")
+    assert await async_migrate_entry(hass, entry)
+    assert entry.unique_id == "user@example.com"
+
+
+async def test_setup_without_numpy(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a warning is logged when the energy analytics are disabled."""
+    with (
+        patch("custom_components.remeha_home.HAS_NUMPY", False),
+        patch("custom_components.remeha_home.async_get_clientsession"),
+    ):
+        assert await async_setup(hass, {})
+
+    assert "NumPy is not installed" in caplog.text
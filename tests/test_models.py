@@ -0,0 +1,55 @@
+"""Tests for the Remeha Home dashboard models."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.remeha_home.models import (
+    RemehaHomeInvalidData,
+    dashboard_as_dict,
+    parse_dashboard,
+)
+
+
+def test_parse_dashboard(dashboard: dict) -> None:
+    """Test parsing the dashboard keeps the used fields."""
+    data = parse_dashboard(dashboard)
+
+    appliance = data["appliances"][0]
+    assert appliance.water_pressure == 1.4
+    assert appliance.climate_zones[0].set_point == 16.0
+    assert parse_dashboard(dashboard_as_dict(data)) == data
+
+
+def test_parse_dashboard_missing_sensor_field(dashboard: dict) -> None:
+    """Test a missing sensor field only leaves that value unknown."""
+    del dashboard["appliances"][0]["waterPressure"]
+    del dashboard["appliances"][0]["climateZones"][0]["nextSetpoint"]
+
+    data = parse_dashboard(dashboard)
+
+    appliance = data["appliances"][0]
+    assert appliance.water_pressure is None
+    assert appliance.climate_zones[0].next_setpoint is None
+    assert appliance.climate_zones[0].set_point == 16.0
+
+
+@pytest.mark.parametrize(
+    "remove",
+    [
+        lambda dashboard: dashboard["appliances"][0].pop("applianceId"),
+        lambda dashboard: dashboard["appliances"][0].pop("climateZones"),
+        lambda dashboard: dashboard["appliances"][0]["climateZones"][0].pop(
+            "climateZoneId"
+        ),
+        lambda dashboard: dashboard["appliances"][0]["hotWaterZones"][0].pop(
+            "hotWaterZoneId"
+        ),
+    ],
+)
+def test_parse_dashboard_missing_required_field(dashboard: dict, remove) -> None:
+    """Test a missing id or list of zones makes the dashboard invalid."""
+    remove(dashboard)
+
+    with pytest.raises(RemehaHomeInvalidData):
+        parse_dashboard(dashboard)
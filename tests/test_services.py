@@ -0,0 +1,42 @@
+"""Tests for the Remeha Home services."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.remeha_home.const import DOMAIN, SERVICE_PROFILE
+from custom_components.remeha_home.coordinator import RemehaHomeUpdateCoordinator
+from custom_components.remeha_home.services import async_setup_services
+
+
+async def test_profile(
+    hass: HomeAssistant, tmp_path: Path, mock_api: MagicMock
+) -> None:
+    """Test the profile service returns at once and reports the refreshes later."""
+    hass.config.config_dir = str(tmp_path)
+    coordinator = RemehaHomeUpdateCoordinator(hass, mock_api)
+    await coordinator.async_refresh()
+    hass.data[DOMAIN] = {"entry": {"coordinator": coordinator}}
+    async_setup_services(hass)
+
+    with patch(
+        "custom_components.remeha_home.services.persistent_notification.async_create"
+    ) as create_notification:
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {"refreshes": 2}, blocking=True
+        )
+        assert coordinator.profiler is not None
+        create_notification.assert_not_called()
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.profiler is None
+    create_notification.assert_called_once()
+    assert "Profiled 2 refreshes" in create_notification.call_args[0][1]
+    assert len(list(tmp_path.glob(f"{DOMAIN}_profile_*.prof"))) == 1
+    await coordinator.async_shutdown()